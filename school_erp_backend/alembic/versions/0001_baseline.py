@@ -0,0 +1,22 @@
+"""baseline: schema as created by Base.metadata.create_all
+
+Existing databases were built by create_all at startup, so this revision
+changes nothing; it only gives later revisions a common parent.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
@@ -0,0 +1,155 @@
+"""index pack for multi-tenant hot filters
+
+Adds the composite indexes declared on the models, the unique keys used by
+the attendance / exam-mark upserts, and the attendance rollup tables.
+Every step checks the live schema first, so databases that already got
+some of these from create_all upgrade cleanly.
+
+Duplicate (student_id, date) attendance rows and duplicate
+(exam_id, student_id, subject_id) marks are collapsed to the newest row
+before the unique keys are added. The rollup tables are then backfilled
+from the existing attendance rows.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("students", "ix_students_institute_class_section", ["institute_id", "class_id", "section_id"]),
+    ("students", "ix_students_institute_admission_no", ["institute_id", "admission_no"]),
+    ("student_attendance", "ix_student_attendance_institute_date", ["institute_id", "date"]),
+    ("student_attendance", "ix_student_attendance_class_section_date", ["institute_id", "class_id", "section_id", "date"]),
+    ("employee_attendance", "ix_employee_attendance_institute_date", ["institute_id", "date"]),
+    ("employee_attendance", "ix_employee_attendance_employee_date", ["employee_id", "date"]),
+    ("student_fees", "ix_student_fees_institute_paid", ["institute_id", "is_paid"]),
+    ("student_fees", "ix_student_fees_student", ["student_id"]),
+    ("fee_payments", "ix_fee_payments_institute_date", ["institute_id", "payment_date"]),
+    ("fee_payments", "ix_fee_payments_student_fee", ["student_fee_id"]),
+    ("employees", "ix_employees_institute", ["institute_id"]),
+    ("timetables", "ix_timetables_class_section", ["institute_id", "class_id", "section_id", "weekday_id", "period_no"]),
+    ("timetables", "ix_timetables_teacher", ["institute_id", "teacher_id"]),
+    ("homework", "ix_homework_institute_due", ["institute_id", "due_date"]),
+    ("exams", "ix_exams_institute", ["institute_id"]),
+    ("messages", "ix_messages_inbox", ["institute_id", "receiver_role", "created_at"]),
+]
+
+UNIQUES = [
+    ("student_attendance", "uq_student_attendance_student_date", ["student_id", "date"]),
+    ("exam_marks", "uq_exam_marks_exam_student_subject", ["exam_id", "student_id", "subject_id"]),
+]
+
+
+def _existing_indexes(inspector, table):
+    names = {i["name"] for i in inspector.get_indexes(table)}
+    names |= {u["name"] for u in inspector.get_unique_constraints(table)}
+    return names
+
+
+# rollup table → (raw attendance table, rollup key)
+ROLLUPS = [
+    ("student_attendance_rollup", "student_attendance", ["institute_id", "class_id", "section_id", "date"]),
+    ("employee_attendance_rollup", "employee_attendance", ["institute_id", "date"]),
+]
+
+
+def _backfill(rollup, raw, keys):
+    # LEAVE is a reserved word in MySQL → quoted
+    columns = ", ".join(keys)
+    op.execute(f"DELETE FROM {rollup}")
+    op.execute(
+        f"INSERT INTO {rollup} ({columns}, present, absent, `leave`, total) "
+        f"SELECT {columns}, "
+        f"SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END), "
+        f"SUM(CASE WHEN status = 'absent' THEN 1 ELSE 0 END), "
+        f"SUM(CASE WHEN status = 'leave' THEN 1 ELSE 0 END), "
+        f"COUNT(id) "
+        f"FROM {raw} GROUP BY {columns}"
+    )
+
+
+def _dedupe(table, columns):
+    # keep the newest row of each duplicate group
+    join = " AND ".join(f"a.{c} = b.{c}" for c in columns)
+    op.execute(
+        f"DELETE a FROM {table} a JOIN {table} b ON {join} AND a.id < b.id"
+    )
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    # 🔹 1. Attendance rollups
+    if "student_attendance_rollup" not in tables:
+        op.create_table(
+            "student_attendance_rollup",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("institute_id", sa.Integer, nullable=False),
+            sa.Column("class_id", sa.Integer, nullable=False),
+            sa.Column("section_id", sa.Integer, nullable=False),
+            sa.Column("date", sa.Date, nullable=False),
+            sa.Column("present", sa.Integer, nullable=False),
+            sa.Column("absent", sa.Integer, nullable=False),
+            sa.Column("leave", sa.Integer, nullable=False),
+            sa.Column("total", sa.Integer, nullable=False),
+            sa.UniqueConstraint(
+                "institute_id", "class_id", "section_id", "date",
+                name="uq_student_attendance_rollup_key"
+            ),
+        )
+
+    if "employee_attendance_rollup" not in tables:
+        op.create_table(
+            "employee_attendance_rollup",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("institute_id", sa.Integer, nullable=False),
+            sa.Column("date", sa.Date, nullable=False),
+            sa.Column("present", sa.Integer, nullable=False),
+            sa.Column("absent", sa.Integer, nullable=False),
+            sa.Column("leave", sa.Integer, nullable=False),
+            sa.Column("total", sa.Integer, nullable=False),
+            sa.UniqueConstraint(
+                "institute_id", "date",
+                name="uq_employee_attendance_rollup_key"
+            ),
+        )
+
+    # 🔹 2. Unique keys backing the bulk upserts
+    for table, name, columns in UNIQUES:
+        if name in _existing_indexes(inspector, table):
+            continue
+        _dedupe(table, columns)
+        op.create_unique_constraint(name, table, columns)
+
+    # 🔹 3. Backfill the rollups (after the dedupe → one row per student/day)
+    for rollup, raw, keys in ROLLUPS:
+        _backfill(rollup, raw, keys)
+
+    # 🔹 4. Composite indexes
+    for table, name, columns in INDEXES:
+        if name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for table, name, columns in reversed(INDEXES):
+        if name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
+
+    for table, name, columns in reversed(UNIQUES):
+        if name in _existing_indexes(inspector, table):
+            op.drop_constraint(name, table, type_="unique")
+
+    op.drop_table("employee_attendance_rollup")
+    op.drop_table("student_attendance_rollup")
@@ -0,0 +1,35 @@
+"""unread counter index for messages
+
+Covers /notifications/unread and /notifications/unread/count. receiver_role
+leads so superadmins (no institute) still get an index range scan.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def _has_index(name):
+    inspector = sa.inspect(op.get_bind())
+    return name in {i["name"] for i in inspector.get_indexes("messages")}
+
+
+def upgrade():
+    if not _has_index("ix_messages_unread"):
+        op.create_index(
+            "ix_messages_unread",
+            "messages",
+            ["receiver_role", "is_read", "institute_id", "created_at"]
+        )
+
+
+def downgrade():
+    if _has_index("ix_messages_unread"):
+        op.drop_index("ix_messages_unread", table_name="messages")
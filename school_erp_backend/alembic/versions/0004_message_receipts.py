@@ -0,0 +1,62 @@
+"""per-recipient read receipts for messages
+
+Replaces the global Message.is_read flag with message_receipts rows.
+Direct messages already flagged as read get a receipt for their receiver;
+read flags on broadcasts cannot be attributed and are dropped.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "message_receipts" not in inspector.get_table_names():
+        op.create_table(
+            "message_receipts",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("message_id", sa.Integer, nullable=False),
+            sa.Column("user_id", sa.Integer, nullable=False),
+            sa.Column(
+                "read_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now()
+            ),
+            sa.UniqueConstraint(
+                "message_id", "user_id",
+                name="uq_message_receipts_message_user"
+            ),
+        )
+        op.create_index(
+            "ix_message_receipts_user",
+            "message_receipts",
+            ["user_id", "message_id"]
+        )
+
+        op.execute(
+            "INSERT INTO message_receipts (message_id, user_id, read_at) "
+            "SELECT id, receiver_id, created_at FROM messages "
+            "WHERE is_read = 1 AND receiver_id IS NOT NULL"
+        )
+
+    # is_read is no longer queried
+    if "ix_messages_unread" in {i["name"] for i in inspector.get_indexes("messages")}:
+        op.drop_index("ix_messages_unread", table_name="messages")
+
+
+def downgrade():
+    op.create_index(
+        "ix_messages_unread",
+        "messages",
+        ["receiver_role", "is_read", "institute_id", "created_at"]
+    )
+    op.drop_table("message_receipts")
@@ -0,0 +1,35 @@
+"""content hash and size on message attachments
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {c["name"] for c in inspector.get_columns("message_attachments")}
+
+    if "content_hash" not in columns:
+        op.add_column(
+            "message_attachments",
+            sa.Column("content_hash", sa.String(64), nullable=True)
+        )
+
+    if "file_size" not in columns:
+        op.add_column(
+            "message_attachments",
+            sa.Column("file_size", sa.Integer, nullable=True)
+        )
+
+
+def downgrade():
+    op.drop_column("message_attachments", "file_size")
+    op.drop_column("message_attachments", "content_hash")
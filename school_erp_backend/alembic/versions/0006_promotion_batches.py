@@ -0,0 +1,37 @@
+"""batch id on promotion logs for resumable rollovers
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "batch_id" not in {c["name"] for c in inspector.get_columns("promotion_logs")}:
+        op.add_column(
+            "promotion_logs",
+            sa.Column("batch_id", sa.String(64), nullable=True)
+        )
+
+    if "ix_promotion_logs_batch_student" not in {
+        i["name"] for i in inspector.get_indexes("promotion_logs")
+    }:
+        op.create_index(
+            "ix_promotion_logs_batch_student",
+            "promotion_logs",
+            ["batch_id", "student_id"]
+        )
+
+
+def downgrade():
+    op.drop_index("ix_promotion_logs_batch_student", table_name="promotion_logs")
+    op.drop_column("promotion_logs", "batch_id")
@@ -0,0 +1,27 @@
+"""token_version on users for claim-based JWT revocation
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "token_version" not in {c["name"] for c in inspector.get_columns("users")}:
+        op.add_column(
+            "users",
+            sa.Column("token_version", sa.Integer, nullable=False, server_default="0")
+        )
+
+
+def downgrade():
+    op.drop_column("users", "token_version")
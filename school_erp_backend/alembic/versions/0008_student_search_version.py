@@ -0,0 +1,27 @@
+"""student_search_version on institutes for cross-worker search invalidation
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if "student_search_version" not in {c["name"] for c in inspector.get_columns("institutes")}:
+        op.add_column(
+            "institutes",
+            sa.Column("student_search_version", sa.Integer, nullable=False, server_default="0")
+        )
+
+
+def downgrade():
+    op.drop_column("institutes", "student_search_version")
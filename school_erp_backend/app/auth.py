@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.user import User
+from app.principal import get_principal, token_is_current, Principal
 import os
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -24,8 +24,40 @@ def get_current_user(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
+    user = get_principal(db, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
     return user
+
+
+def get_token_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Role / permission guards: the principal comes from the token claims.
+    Only a cached token-version check can hit the DB.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = payload.get("user_id")
+        if user_id is None:
+            raise HTTPException(status_code=401)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # tokens issued before claims were added → full principal
+    if "pv" not in payload:
+        user = get_principal(db, user_id)
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        return user
+
+    if not token_is_current(db, user_id, payload["pv"]):
+        raise HTTPException(
+            status_code=401,
+            detail="Session expired, please log in again"
+        )
+
+    return Principal.from_claims(payload)
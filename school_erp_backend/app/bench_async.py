@@ -0,0 +1,95 @@
+# Sync vs async read-path load comparison against two running servers.
+# Start the same seeded database behind two builds: the last commit before
+# the async port (sync handlers) and the current tree, e.g.
+#   git worktree add /tmp/erp-sync <last commit before the async port>
+#   (cd /tmp/erp-sync/school_erp_backend && uvicorn app.main:app --port 8100)
+#   uvicorn app.main:app --port 8000
+# Usage: python -m app.bench_async --sync-url http://127.0.0.1:8100 \
+#            --async-url http://127.0.0.1:8000 --token <jwt> \
+#            [--path /notifications/unread ...] [--requests 2000] [--concurrency 100]
+import argparse
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# endpoints ported to get_async_db
+DEFAULT_PATHS = [
+    "/messages/inbox",
+    "/notifications/unread",
+    "/dashboard/admin",
+    "/dashboard1/summary",
+    "/timetable/",
+]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--sync-url", required=True)
+parser.add_argument("--async-url", required=True)
+parser.add_argument("--token", required=True)
+parser.add_argument("--path", action="append", dest="paths",
+                    help="endpoint to load (repeatable, default: the ported reads)")
+parser.add_argument("--requests", type=int, default=2000)
+parser.add_argument("--concurrency", type=int, default=100)
+args = parser.parse_args()
+
+paths = args.paths or DEFAULT_PATHS
+headers = {"Authorization": f"Bearer {args.token}"}
+
+
+def fetch(url):
+    request = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            status = response.status
+            response.read()
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = "error"
+    return status, time.perf_counter() - started
+
+
+def percentile(values, p):
+    index = min(len(values) - 1, round(p / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def run(base_url):
+    # round-robin over the paths → mixed traffic like a real morning
+    urls = [f"{base_url}{paths[i % len(paths)]}" for i in range(args.requests)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - started
+
+    ok = sorted(t * 1000 for status, t in results if status == 200)
+    return {
+        "statuses": dict(Counter(status for status, _ in results)),
+        "rps": len(ok) / elapsed,
+        "p50": percentile(ok, 50) if ok else None,
+        "p99": percentile(ok, 99) if ok else None,
+    }
+
+
+print(f"requests     {args.requests} (concurrency {args.concurrency})")
+print(f"paths        {', '.join(paths)}")
+
+report = {}
+for name, url in (("sync", args.sync_url), ("async", args.async_url)):
+    report[name] = result = run(url)
+    print(f"\n[{name}] {url}")
+    print(f"statuses     {result['statuses']}")
+    if result["p50"] is None:
+        print("no successful requests")
+        continue
+    print(f"p50          {result['p50']:.1f} ms")
+    print(f"p99          {result['p99']:.1f} ms")
+    print(f"requests/s   {result['rps']:.1f}")
+
+if not report["sync"]["rps"] or not report["async"]["rps"]:
+    raise SystemExit(1)
+
+print(f"\nasync / sync throughput  {report['async']['rps'] / report['sync']['rps']:.2f}x")
@@ -0,0 +1,74 @@
+# Cold-start benchmark: boots app.main in fresh interpreters, like a new worker.
+# Usage: python -m app.bench_boot [--runs 10] [--slow-boot]
+#   --slow-boot sets FAST_BOOT=false (create_all on import → needs the database)
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--runs", type=int, default=10)
+parser.add_argument("--slow-boot", action="store_true")
+args = parser.parse_args()
+
+# runs inside the child: import the app, then fire the startup handlers
+CHILD = """
+import asyncio, inspect, json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+for handler in app.main.app.router.on_startup:
+    if inspect.iscoroutine(result := handler()):
+        asyncio.run(result)
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "boot_ms": app.main.app.state.boot_ms,
+    "reportlab": "reportlab" in sys.modules,
+    "modules": len(sys.modules),
+}))
+"""
+
+env = dict(os.environ, FAST_BOOT="false" if args.slow_boot else "true")
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def boot():
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=root, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit(1)
+
+    run = json.loads(result.stdout.strip().splitlines()[-1])
+    run["wall_ms"] = wall_ms
+    return run
+
+
+def percentile(values, p):
+    values = sorted(values)
+    index = min(len(values) - 1, round(p / 100 * (len(values) - 1)))
+    return values[index]
+
+
+runs = [boot() for _ in range(args.runs)]
+
+print(f"runs         {args.runs} (fast_boot={not args.slow_boot})")
+for field, label in (
+    ("import_ms", "import"),
+    ("boot_ms", "ready"),
+    ("wall_ms", "process"),
+):
+    values = [r[field] for r in runs]
+    print(
+        f"{label:<12} p50 {percentile(values, 50):.1f} ms  "
+        f"p99 {percentile(values, 99):.1f} ms  max {max(values):.1f} ms"
+    )
+print(f"modules      {runs[-1]['modules']}")
+print(f"reportlab    {'imported at boot' if runs[-1]['reportlab'] else 'lazy'}")
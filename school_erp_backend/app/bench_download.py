@@ -0,0 +1,83 @@
+# Attachment download throughput against a running server.
+# Usage: python -m app.bench_download --url http://127.0.0.1:8000 --token <jwt> \
+#            --attachment 42 [--requests 200] [--concurrency 20] \
+#            [--range 0-1048575] [--revalidate]
+#   --range       send a Range header (mobile clients resuming a download)
+#   --revalidate  send If-None-Match with the ETag of a first download (→ 304s)
+import argparse
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 64 * 1024
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--url", default="http://127.0.0.1:8000")
+parser.add_argument("--token", required=True)
+parser.add_argument("--attachment", type=int, required=True)
+parser.add_argument("--requests", type=int, default=200)
+parser.add_argument("--concurrency", type=int, default=20)
+parser.add_argument("--range", help="byte range, e.g. 0-1048575")
+parser.add_argument("--revalidate", action="store_true")
+args = parser.parse_args()
+
+url = f"{args.url}/messages/attachments/{args.attachment}"
+headers = {"Authorization": f"Bearer {args.token}"}
+if args.range:
+    headers["Range"] = f"bytes={args.range}"
+
+
+def download(extra_headers):
+    request = urllib.request.Request(url, headers={**headers, **extra_headers})
+    started = time.perf_counter()
+    size, etag = 0, None
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            status = response.status
+            etag = response.headers.get("ETag")
+            while chunk := response.read(CHUNK_SIZE):
+                size += len(chunk)
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = "error"
+    return status, size, etag, time.perf_counter() - started
+
+
+def percentile(values, p):
+    index = min(len(values) - 1, round(p / 100 * (len(values) - 1)))
+    return values[index]
+
+
+# warm-up: checks access and picks up the ETag
+status, size, etag, _ = download({})
+if status not in (200, 206):
+    print(f"attachment {args.attachment} → {status}")
+    raise SystemExit(1)
+
+extra = {"If-None-Match": etag} if args.revalidate and etag else {}
+
+started = time.perf_counter()
+with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+    results = list(pool.map(lambda _: download(extra), range(args.requests)))
+elapsed = time.perf_counter() - started
+
+statuses = Counter(status for status, *_ in results)
+ok = [r for r in results if r[0] in (200, 206, 304)]
+latencies = sorted(t * 1000 for *_, t in ok)
+received = sum(size for _, size, _, _ in ok)
+
+print(f"requests     {args.requests} (concurrency {args.concurrency})")
+print(f"file         {size} bytes per response, etag {etag}")
+print(f"statuses     {dict(statuses)}")
+
+if not ok:
+    print("no successful downloads")
+    raise SystemExit(1)
+
+print(f"p50          {percentile(latencies, 50):.1f} ms")
+print(f"p99          {percentile(latencies, 99):.1f} ms")
+print(f"downloads/s  {len(ok) / elapsed:.1f}")
+print(f"throughput   {received / elapsed / 1024 / 1024:.1f} MiB/s")
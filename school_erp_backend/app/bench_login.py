@@ -0,0 +1,67 @@
+# Login load benchmark against a running server (school-start spike).
+# Usage: python -m app.bench_login --url http://127.0.0.1:8000 \
+#            --email student@x.com --password secret [--requests 500] [--concurrency 50] [--cores 4]
+import argparse
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--url", default="http://127.0.0.1:8000")
+parser.add_argument("--email", required=True)
+parser.add_argument("--password", required=True)
+parser.add_argument("--requests", type=int, default=500)
+parser.add_argument("--concurrency", type=int, default=50)
+parser.add_argument("--cores", type=int, default=os.cpu_count() or 1,
+                    help="cores available to the server (for logins/s per core)")
+args = parser.parse_args()
+
+body = json.dumps({"email": args.email, "password": args.password}).encode()
+
+
+def login(_):
+    request = urllib.request.Request(
+        f"{args.url}/auth/login",
+        data=body,
+        headers={"Content-Type": "application/json"}
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            status = response.status
+            response.read()
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = "error"
+    return status, time.perf_counter() - started
+
+
+def percentile(values, p):
+    index = min(len(values) - 1, round(p / 100 * (len(values) - 1)))
+    return values[index]
+
+
+started = time.perf_counter()
+with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+    results = list(pool.map(login, range(args.requests)))
+elapsed = time.perf_counter() - started
+
+statuses = Counter(status for status, _ in results)
+ok = sorted(t * 1000 for status, t in results if status == 200)
+
+print(f"requests     {args.requests} (concurrency {args.concurrency})")
+print(f"statuses     {dict(statuses)}")
+
+if not ok:
+    print("no successful logins")
+    raise SystemExit(1)
+
+print(f"p50          {percentile(ok, 50):.1f} ms")
+print(f"p99          {percentile(ok, 99):.1f} ms")
+print(f"logins/s     {len(ok) / elapsed:.1f}")
+print(f"per core     {len(ok) / elapsed / args.cores:.1f} logins/s ({args.cores} cores)")
@@ -0,0 +1,150 @@
+# Year-end rollover timing for a 5,000-student school on a scratch database.
+# Seeds 12 classes x 2 sections, then times the dry run and the bulk rollover.
+# Usage: python -m app.bench_promotion [--url mysql+pymysql://u:p@host/erp_bench] \
+#            [--students 5000] [--chunk-size 1000] [--per-student]
+#   --url          scratch database (tables are created, rows are added);
+#                  default is a throwaway sqlite file
+#   --per-student  also time one UPDATE + log INSERT per student (old loop)
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import load_all_models
+from app.models.class_model import SchoolClass
+from app.models.section import Section
+from app.models.student import Student
+from app.models.promotion_log import PromotionLog
+from app.services.promotion_engine import promote_classes, promote_ids
+
+CLASSES = 12
+SECTIONS = ("A", "B")
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--url")
+parser.add_argument("--students", type=int, default=5000)
+parser.add_argument("--chunk-size", type=int, default=1000)
+parser.add_argument("--institute", type=int, default=900001,
+                    help="institute id used for the seeded rows")
+parser.add_argument("--per-student", action="store_true")
+args = parser.parse_args()
+
+url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+engine = create_engine(url)
+Session = sessionmaker(bind=engine, autoflush=False)
+
+load_all_models()
+Base.metadata.create_all(engine)
+
+statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+def seed(db):
+    """One school: classes 1..12, sections A/B, students spread evenly."""
+    institute_id = args.institute
+    classes = []
+    for n in range(1, CLASSES + 1):
+        cls = SchoolClass(name=str(n), institute_id=institute_id)
+        db.add(cls)
+        db.flush()
+        classes.append(cls)
+        for name in SECTIONS:
+            db.add(Section(name=name, class_id=cls.id, institute_id=institute_id))
+    db.flush()
+
+    sections = {
+        (s.class_id, s.name): s.id
+        for s in db.query(Section).filter(Section.institute_id == institute_id)
+    }
+
+    # class 12 graduates → students sit in classes 1..11
+    rows = []
+    for i in range(args.students):
+        cls = classes[i % (CLASSES - 1)]
+        section = SECTIONS[i % len(SECTIONS)]
+        rows.append({
+            "name": f"Student {i}",
+            "admission_no": f"B{institute_id}-{i}",
+            "class_name": cls.name,
+            "class_id": cls.id,
+            "section": section,
+            "section_id": sections[(cls.id, section)],
+            "institute_id": institute_id,
+        })
+    db.bulk_insert_mappings(Student, rows)
+    db.commit()
+    return classes
+
+
+def timed(label, fn):
+    global statements
+    statements = 0
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<14} {elapsed * 1000:9.1f} ms  {statements:6d} statements")
+    return result
+
+
+with Session() as db:
+    if db.query(Student).filter(Student.institute_id == args.institute).count():
+        print(f"institute {args.institute} already has students, pick another --institute")
+        raise SystemExit(1)
+
+    classes = timed("seed", lambda: seed(db))
+
+    # 11→12 first, … 1→2 last (order_mappings does the sorting)
+    mappings = [
+        {"from_class_id": classes[n].id, "to_class_id": classes[n + 1].id}
+        for n in range(CLASSES - 1)
+    ]
+
+    print(f"students       {args.students} in {CLASSES - 1} classes (chunk {args.chunk_size})")
+
+    dry = timed("dry run", lambda: promote_classes(
+        db, args.institute, mappings, uuid.uuid4().hex, dry_run=True
+    ))
+    print(f"{'':14} {sum(r['students'] for r in dry)} students would move")
+
+    batch_id = uuid.uuid4().hex
+    done = timed("rollover", lambda: promote_classes(
+        db, args.institute, mappings, batch_id, chunk_size=args.chunk_size
+    ))
+    moved = sum(r["students"] for r in done)
+
+    logged = db.query(func.count(PromotionLog.id)).filter(
+        PromotionLog.batch_id == batch_id
+    ).scalar()
+    print(f"{'':14} {moved} students moved, {logged} log rows")
+
+    timed("resume (no-op)", lambda: promote_classes(
+        db, args.institute, mappings, batch_id, chunk_size=args.chunk_size
+    ))
+
+    if args.per_student:
+        # the old shape: one UPDATE + one log INSERT per student
+        target = classes[-1]
+        ids = [
+            sid for (sid,) in db.query(Student.id).filter(
+                Student.institute_id == args.institute,
+                Student.class_id != target.id
+            )
+        ]
+
+        def per_student():
+            for sid in ids:
+                promote_ids(db, [sid], target)
+            db.commit()
+
+        timed("per-student", per_student)
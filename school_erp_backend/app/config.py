@@ -1,3 +1,5 @@
+import os
+
 MESSAGE_UPLOAD_DIR = "uploads/messages"
 MAX_FILE_SIZE_MB = 10
 
@@ -8,3 +10,14 @@ ALLOWED_FILE_TYPES = {
     "application/msword",
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 }
+
+REPORT_CACHE_DIR = "reports/cache"
+REPORT_CACHE_TTL_SECONDS = 30 * 60
+REPORT_RENDER_WORKERS = 2
+REPORT_ROWS_PER_TABLE = 40
+
+# one bcrypt process pool per worker: login checks + bulk login hashing
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+# login password checks beyond this get 503 + Retry-After
+LOGIN_MAX_PENDING = int(os.getenv("LOGIN_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 8)))
@@ -0,0 +1,142 @@
+# EXPLAIN the hot router queries against a seeded MySQL and fail on full scans.
+# Usage: python -m app.explain_queries [--institute 1] [--day 2025-04-01] [--verbose]
+import argparse
+import sys
+from types import SimpleNamespace
+from datetime import date
+
+from sqlalchemy import or_
+
+from app.database import engine, SessionLocal
+from app.models.student import Student
+from app.models.student_attendance import StudentAttendance
+from app.models.employee_attendance import EmployeeAttendance
+from app.models.student_attendance_rollup import StudentAttendanceRollup
+from app.models.exam_mark import ExamMark
+from app.models.fee_payment import FeePayment
+from app.models.homework import Homework
+from app.models.message import Message
+from app.models.timetable import Timetable
+from app.services.fee_defaulters import _base_query, due_amount_expr
+from app.models.student_fee import StudentFee
+from app.services.message_delivery import unread_filter
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--institute", type=int, default=1)
+parser.add_argument("--day", type=date.fromisoformat, default=date.today())
+parser.add_argument("--verbose", action="store_true")
+args = parser.parse_args()
+
+institute_id = args.institute
+day = args.day
+month_start = day.replace(day=1)
+
+# stand-in principal for the message audience filters
+reader = SimpleNamespace(
+    id=1, role="student", institute_id=institute_id,
+    class_id=1, designation=None
+)
+
+
+def top_queries(db):
+    # mirrors the filters used by the routers / services
+    return {
+        "students by class/section": db.query(Student).filter(
+            Student.institute_id == institute_id,
+            Student.class_id == 1,
+            Student.section_id == 1
+        ).order_by(Student.id),
+
+        "student attendance range": db.query(StudentAttendance).filter(
+            StudentAttendance.institute_id == institute_id,
+            StudentAttendance.date.between(month_start, day)
+        ).order_by(StudentAttendance.date),
+
+        "student attendance rollup key": db.query(StudentAttendance).filter(
+            StudentAttendance.institute_id == institute_id,
+            StudentAttendance.class_id == 1,
+            StudentAttendance.section_id == 1,
+            StudentAttendance.date == day
+        ),
+
+        "attendance rollup read": db.query(StudentAttendanceRollup).filter(
+            StudentAttendanceRollup.institute_id == institute_id,
+            StudentAttendanceRollup.date.between(month_start, day)
+        ),
+
+        "employee attendance day": db.query(EmployeeAttendance).filter(
+            EmployeeAttendance.institute_id == institute_id,
+            EmployeeAttendance.date == day
+        ),
+
+        "messages inbox": db.query(Message).filter(
+            Message.institute_id == institute_id,
+            Message.receiver_role == "employee",
+            or_(Message.receiver_id == None, Message.receiver_id == 1)
+        ).order_by(Message.created_at.desc(), Message.id.desc()).limit(50),
+
+        "unread notifications": db.query(Message).filter(
+            unread_filter(reader)
+        ).order_by(Message.created_at.desc()).limit(10),
+
+        "exam marks by exam": db.query(ExamMark).filter(
+            ExamMark.exam_id == 1,
+            ExamMark.student_id == 1
+        ),
+
+        "fee defaulters": _base_query(
+            db,
+            [StudentFee.id, due_amount_expr()],
+            institute_id
+        ),
+
+        "fee collection month": db.query(FeePayment).filter(
+            FeePayment.institute_id == institute_id,
+            FeePayment.payment_date >= month_start
+        ),
+
+        "class timetable": db.query(Timetable).filter(
+            Timetable.institute_id == institute_id,
+            Timetable.class_id == 1,
+            Timetable.section_id == 1
+        ).order_by(Timetable.weekday_id, Timetable.period_no),
+
+        "active homework": db.query(Homework).filter(
+            Homework.institute_id == institute_id,
+            Homework.due_date >= day
+        ),
+    }
+
+
+db = SessionLocal()
+failures = []
+
+with engine.connect() as conn:
+    for name, query in top_queries(db).items():
+        compiled = query.statement.compile(
+            dialect=engine.dialect,
+            compile_kwargs={"render_postcompile": True}
+        )
+        plan = conn.exec_driver_sql(
+            f"EXPLAIN {compiled}", compiled.params
+        ).mappings().all()
+
+        # type=ALL → the table is read end to end
+        scans = [row["table"] for row in plan if row["type"] == "ALL"]
+        status = "FULL SCAN: " + ", ".join(scans) if scans else "ok"
+        print(f"{name:32} {status}")
+
+        if args.verbose:
+            for row in plan:
+                print(f"    {row['table']:24} type={row['type']} key={row['key']} rows={row['rows']}")
+
+        if scans:
+            failures.append(name)
+
+db.close()
+
+if failures:
+    print(f"\n{len(failures)} queries do full table scans")
+    sys.exit(1)
+
+print("\nAll queries use an index")
@@ -1,6 +1,14 @@
+import logging
+import os
+import time
+
+BOOT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI
 from app.database import Base, engine
-from app.routers import auth,institute,students,attendance,employees,attendance_reports,classes,subjects,exams,results,fees,homework,salary,promotion,dashboard,reports,students_search,sections,syllabus,fee_fine,timetable,weekday,period,messages,notifications,dashboard1
+from app.services.password_pool import shutdown_password_pool
+from app.services.report_pdf import shutdown_render_pool
+from app.routers import auth,institute,students,attendance,employees,attendance_reports,classes,subjects,exams,results,fees,homework,salary,promotion,dashboard,reports,students_search,sections,syllabus,fee_fine,timetable,weekday,period,messages,notifications,dashboard1,internal
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(title="School ERP API")
@@ -18,7 +26,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Base.metadata.create_all(bind=engine)
+# Schema is managed by `python -m app.migrate`.
+# FAST_BOOT=false brings back create_all on import (local dev only).
+FAST_BOOT = os.getenv("FAST_BOOT", "true").lower() in ("1", "true", "yes")
+
+if not FAST_BOOT:
+    Base.metadata.create_all(bind=engine)
 
 app.include_router(auth.router)
 app.include_router(institute.router)
@@ -46,6 +59,27 @@ app.include_router(period.router)
 app.include_router(messages.router)
 app.include_router(notifications.router)
 app.include_router(dashboard1.router)
+app.include_router(internal.router)
+
+
+@app.on_event("startup")
+def record_boot_time():
+    # cold-start latency of this worker: first import → ready to serve
+    app.state.boot_ms = round((time.perf_counter() - BOOT_STARTED) * 1000, 1)
+    logging.getLogger("uvicorn.error").info(
+        "worker %s ready in %.1f ms (fast_boot=%s)",
+        os.getpid(), app.state.boot_ms, FAST_BOOT
+    )
+
+
+@app.on_event("shutdown")
+def stop_password_pool():
+    shutdown_password_pool()
+
+
+@app.on_event("shutdown")
+def stop_render_pool():
+    shutdown_render_pool()
 
 
 @app.get("/")
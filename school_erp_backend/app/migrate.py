@@ -0,0 +1,34 @@
+# Apply database migrations (schema is no longer created at app startup).
+# Usage: python -m app.migrate
+# Empty database → create_all + stamp head; existing one → alembic upgrade head.
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.database import Base, engine
+from app.models import load_all_models
+
+ALEMBIC_INI = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "alembic.ini"
+)
+
+load_all_models()
+
+config = Config(ALEMBIC_INI)
+config.set_main_option(
+    "script_location",
+    os.path.join(os.path.dirname(ALEMBIC_INI), "alembic")
+)
+
+tables = set(inspect(engine).get_table_names()) - {"alembic_version"}
+
+if not tables:
+    Base.metadata.create_all(bind=engine)
+    command.stamp(config, "head")
+    print("Schema created")
+else:
+    command.upgrade(config, "head")
+    print("Schema migrated")
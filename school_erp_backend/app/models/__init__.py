@@ -1,3 +1,6 @@
+import importlib
+import pkgutil
+
 from .user import User
 from .institute import Institute
 from .student import Student
@@ -19,3 +22,13 @@ from .homework import Homework
 from .employee_salary import EmployeeSalary
 from .salary_payment import SalaryPayment
 from .promotion_log import PromotionLog
+from .student_attendance_rollup import StudentAttendanceRollup
+from .employee_attendance_rollup import EmployeeAttendanceRollup
+
+
+def load_all_models():
+    # registers every model module on Base (only some are re-exported above);
+    # message_attachments is a stale duplicate of message.MessageAttachment
+    for module in pkgutil.iter_modules(__path__):
+        if module.name != "message_attachments":
+            importlib.import_module(f"{__name__}.{module.name}")
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from app.database import Base
 from sqlalchemy.orm import relationship
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        Index("ix_employees_institute", "institute_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, Date, String
+from sqlalchemy import Column, Integer, Date, String, Index
 from app.database import Base
 
 class EmployeeAttendance(Base):
     __tablename__ = "employee_attendance"
+    __table_args__ = (
+        Index("ix_employee_attendance_institute_date", "institute_id", "date"),
+        Index("ix_employee_attendance_employee_date", "employee_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True)
 
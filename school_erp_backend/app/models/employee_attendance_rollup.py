@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Date, UniqueConstraint
+from app.database import Base
+
+class EmployeeAttendanceRollup(Base):
+    __tablename__ = "employee_attendance_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "institute_id", "date",
+            name="uq_employee_attendance_rollup_key"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    institute_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False)
+
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    leave = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
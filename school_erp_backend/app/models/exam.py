@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index
 from app.database import Base
 from datetime import datetime
 
 
 class Exam(Base):
     __tablename__ = "exams"
+    __table_args__ = (
+        Index("ix_exams_institute", "institute_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)      # Unit Test, Mid Term
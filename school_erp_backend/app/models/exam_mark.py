@@ -1,8 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
 from app.database import Base
 
 class ExamMark(Base):
     __tablename__ = "exam_marks"
+    __table_args__ = (
+        UniqueConstraint(
+            "exam_id", "student_id", "subject_id",
+            name="uq_exam_marks_exam_student_subject"
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
 
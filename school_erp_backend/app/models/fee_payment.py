@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Index
 from app.database import Base
 
 class FeePayment(Base):
     __tablename__ = "fee_payments"
+    __table_args__ = (
+        Index("ix_fee_payments_institute_date", "institute_id", "payment_date"),
+        Index("ix_fee_payments_student_fee", "student_fee_id"),
+    )
 
     id = Column(Integer, primary_key=True)
 
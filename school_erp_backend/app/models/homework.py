@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Index
 from app.database import Base
 
 class Homework(Base):
     __tablename__ = "homework"
+    __table_args__ = (
+        Index("ix_homework_institute_due", "institute_id", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True)
 
@@ -13,3 +13,6 @@ class Institute(Base):
     website = Column(String(255), nullable=True)
     country = Column(String(100), nullable=True)
 
+    # bumped on every student write → per-worker search indexes reload
+    student_search_version = Column(Integer, nullable=False, default=0, server_default="0")
+
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -7,7 +7,13 @@ from app.database import Base
 
 class Message(Base):
     __tablename__ = "messages"
-    __table_args__ = {"extend_existing": True}  # ✅ ADD THIS
+    __table_args__ = (
+        Index(
+            "ix_messages_inbox",
+            "institute_id", "receiver_role", "created_at"
+        ),
+        {"extend_existing": True},  # ✅ ADD THIS
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -58,6 +64,10 @@ class MessageAttachment(Base):
     file_path = Column(String(500), nullable=False)
     file_type = Column(String(50), nullable=False)
 
+    # sha256 of the bytes; identical uploads share one file on disk
+    content_hash = Column(String(64), nullable=True)
+    file_size = Column(Integer, nullable=True)
+
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # ✅ BACK RELATION
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, DateTime, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class MessageReceipt(Base):
+    # one row per (message, reader); broadcasts are never fanned out –
+    # a missing row simply means "unread"
+    __tablename__ = "message_receipts"
+    __table_args__ = (
+        UniqueConstraint(
+            "message_id", "user_id",
+            name="uq_message_receipts_message_user"
+        ),
+        Index("ix_message_receipts_user", "user_id", "message_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    message_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+
+    read_at = Column(DateTime(timezone=True), server_default=func.now())
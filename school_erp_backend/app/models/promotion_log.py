@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Index
 from datetime import date
 from app.database import Base
 
 class PromotionLog(Base):
     __tablename__ = "promotion_logs"
+    __table_args__ = (
+        Index("ix_promotion_logs_batch_student", "batch_id", "student_id"),
+    )
 
     id = Column(Integer, primary_key=True)
 
@@ -18,3 +21,6 @@ class PromotionLog(Base):
     promoted_on = Column(Date, default=date.today)
 
     institute_id = Column(Integer, nullable=False)
+
+    # bulk rollover run; students logged under it are skipped on resume
+    batch_id = Column(String(64), nullable=True)
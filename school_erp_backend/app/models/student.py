@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_institute_class_section", "institute_id", "class_id", "section_id"),
+        Index("ix_students_institute_admission_no", "institute_id", "admission_no"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -1,8 +1,16 @@
-from sqlalchemy import Column, Integer, Date, String
+from sqlalchemy import Column, Integer, Date, String, UniqueConstraint, Index
 from app.database import Base
 
 class StudentAttendance(Base):
     __tablename__ = "student_attendance"
+    __table_args__ = (
+        UniqueConstraint(
+            "student_id", "date",
+            name="uq_student_attendance_student_date"
+        ),
+        Index("ix_student_attendance_institute_date", "institute_id", "date"),
+        Index("ix_student_attendance_class_section_date", "institute_id", "class_id", "section_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True)
 
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Date, UniqueConstraint
+from app.database import Base
+
+class StudentAttendanceRollup(Base):
+    __tablename__ = "student_attendance_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "institute_id", "class_id", "section_id", "date",
+            name="uq_student_attendance_rollup_key"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    institute_id = Column(Integer, nullable=False)
+    class_id = Column(Integer, nullable=False)
+    section_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False)
+
+    present = Column(Integer, nullable=False, default=0)
+    absent = Column(Integer, nullable=False, default=0)
+    leave = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)   # all marked rows
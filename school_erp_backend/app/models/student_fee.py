@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Boolean,Date
+from sqlalchemy import Column, Integer, String, Boolean,Date, Index
 from app.database import Base
 from datetime import date
 
 class StudentFee(Base):
     __tablename__ = "student_fees"
+    __table_args__ = (
+        Index("ix_student_fees_institute_paid", "institute_id", "is_paid"),
+        Index("ix_student_fees_student", "student_id"),
+    )
 
     id = Column(Integer, primary_key=True)
 
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, Index
 from app.database import Base
 
 class Timetable(Base):
     __tablename__ = "timetables"
+    __table_args__ = (
+        Index("ix_timetables_class_section", "institute_id", "class_id", "section_id", "weekday_id", "period_no"),
+        Index("ix_timetables_teacher", "institute_id", "teacher_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     institute_id = Column(Integer, nullable=False)
@@ -14,3 +14,6 @@ class User(Base):
 
     institute_id = Column(Integer, nullable=True)
     is_active = Column(Boolean, default=True)
+
+    # bumped when permissions change → older JWTs are rejected
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
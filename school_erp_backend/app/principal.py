@@ -0,0 +1,209 @@
+import os
+import time
+from threading import Lock
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.employee import Employee
+from app.models.employee_permission import EmployeePermission
+from app.models.student import Student
+
+# ------------------------------------------------------------------
+# Authenticated principal cache
+# NOTE: per-process cache → other workers see changes after the TTL
+# ------------------------------------------------------------------
+PRINCIPAL_CACHE_TTL_SECONDS = int(
+    os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60")
+)
+
+PERMISSION_FLAGS = (
+    "can_students",
+    "can_attendance",
+    "can_exams",
+    "can_fees",
+    "can_salary",
+    "can_homework",
+)
+
+_cache = {}
+_versions = {}      # user_id → (expires, (token_version, is_active))
+_lock = Lock()
+
+
+class Principal:
+    """
+    Read-only snapshot of the logged-in user, used instead of the
+    User ORM row so authorized requests need no users/permissions query.
+    """
+
+    def __init__(self, user, employee=None, perms=None, student=None):
+        self.id = user.id
+        self.name = user.name
+        self.email = user.email
+        self.role = user.role
+        self.institute_id = user.institute_id
+        self.is_active = user.is_active
+
+        self.employee_id = employee.id if employee else None
+        self.designation = employee.designation if employee else None
+
+        # used to resolve class:{id} broadcasts
+        self.student_id = student.id if student else None
+        self.class_id = student.class_id if student else None
+
+        self.permissions = {
+            flag: bool(getattr(perms, flag, False)) if perms else False
+            for flag in PERMISSION_FLAGS
+        }
+
+    @classmethod
+    def from_claims(cls, payload: dict):
+        """
+        Principal rebuilt from JWT claims alone (no query). Only id, role,
+        institute_id, employee_id and permissions are known here.
+        """
+        principal = cls.__new__(cls)
+        principal.id = payload["user_id"]
+        principal.name = None
+        principal.email = None
+        principal.role = payload.get("role")
+        principal.institute_id = payload.get("institute_id")
+        principal.is_active = True
+
+        principal.employee_id = payload.get("eid")
+        principal.designation = None
+        principal.student_id = None
+        principal.class_id = None
+
+        principal.permissions = flags_from_mask(payload.get("perms", 0))
+        return principal
+
+    def has_permission(self, permission: str) -> bool:
+        return self.permissions.get(permission, False)
+
+
+# ------------------------------------------------------------------
+# Token claims: one bit per PERMISSION_FLAGS entry
+# ------------------------------------------------------------------
+def permission_mask(perms) -> int:
+    if not perms:
+        return 0
+    return sum(
+        1 << bit for bit, flag in enumerate(PERMISSION_FLAGS)
+        if getattr(perms, flag, False)
+    )
+
+
+def flags_from_mask(mask: int) -> dict:
+    return {
+        flag: bool(mask & (1 << bit))
+        for bit, flag in enumerate(PERMISSION_FLAGS)
+    }
+
+
+def token_claims(db: Session, user) -> dict:
+    """Claims for create_access_token so guarded routes skip the DB."""
+    row = (
+        db.query(Employee.id, EmployeePermission)
+        .outerjoin(
+            EmployeePermission,
+            EmployeePermission.employee_id == Employee.id
+        )
+        .filter(Employee.user_id == user.id)
+        .first()
+    )
+
+    return {
+        "user_id": user.id,
+        "role": user.role,
+        "institute_id": user.institute_id,
+        "eid": row[0] if row else None,
+        "perms": permission_mask(row[1]) if row else 0,
+        "pv": user.token_version or 0
+    }
+
+
+def load_principal(db: Session, user_id: int):
+    row = (
+        db.query(User, Employee, EmployeePermission, Student)
+        .outerjoin(Employee, Employee.user_id == User.id)
+        .outerjoin(
+            EmployeePermission,
+            EmployeePermission.employee_id == Employee.id
+        )
+        .outerjoin(Student, Student.user_id == User.id)
+        .filter(User.id == user_id, User.is_active == True)
+        .first()
+    )
+
+    if not row:
+        return None
+
+    return Principal(*row)
+
+
+def get_principal(db: Session, user_id: int):
+    now = time.monotonic()
+
+    with _lock:
+        cached = _cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    principal = load_principal(db, user_id)
+    if principal:
+        with _lock:
+            _cache[user_id] = (now + PRINCIPAL_CACHE_TTL_SECONDS, principal)
+
+    return principal
+
+
+def invalidate_principal(user_id: int | None):
+    if not user_id:
+        return
+    with _lock:
+        _cache.pop(user_id, None)
+        _versions.pop(user_id, None)
+
+
+def clear_principals():
+    with _lock:
+        _cache.clear()
+        _versions.clear()
+
+
+# ------------------------------------------------------------------
+# Token versions (revocation for claim-based auth)
+# One primary-key lookup per user per TTL; hits never touch the DB.
+# ------------------------------------------------------------------
+
+def token_is_current(db: Session, user_id: int, version: int) -> bool:
+    now = time.monotonic()
+
+    with _lock:
+        cached = _versions.get(user_id)
+
+    if not cached or cached[0] <= now:
+        row = db.execute(
+            select(User.token_version, User.is_active).where(User.id == user_id)
+        ).first()
+        cached = (now + PRINCIPAL_CACHE_TTL_SECONDS, row)
+        with _lock:
+            _versions[user_id] = cached
+
+    row = cached[1]
+    return bool(row and row.is_active and version >= (row.token_version or 0))
+
+
+def bump_token_version(db: Session, user_id: int | None):
+    """Revokes the user's existing tokens (commit + invalidate_principal after)."""
+    if not user_id:
+        return
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,33 @@
+# Backfill attendance rollups from raw attendance rows.
+# Run `python -m app.migrate` first: the rollup tables come from migration 0002.
+# Usage: python -m app.rebuild_attendance_rollup [--institute 1] [--start 2025-04-01] [--end 2025-04-30]
+import argparse
+from datetime import date
+
+from sqlalchemy import inspect
+
+from app.database import engine, SessionLocal
+from app.models.student_attendance_rollup import StudentAttendanceRollup
+from app.models.employee_attendance_rollup import EmployeeAttendanceRollup
+from app.services.attendance_rollup import rebuild_rollups
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--institute", type=int, default=None)
+parser.add_argument("--start", type=date.fromisoformat, default=None)
+parser.add_argument("--end", type=date.fromisoformat, default=None)
+args = parser.parse_args()
+
+missing = {
+    StudentAttendanceRollup.__tablename__,
+    EmployeeAttendanceRollup.__tablename__
+} - set(inspect(engine).get_table_names())
+
+if missing:
+    print(f"Missing tables {sorted(missing)}, run `python -m app.migrate` first")
+    raise SystemExit(1)
+
+db = SessionLocal()
+rebuild_rollups(db, institute_id=args.institute, start=args.start, end=args.end)
+db.close()
+
+print("Attendance rollups rebuilt")
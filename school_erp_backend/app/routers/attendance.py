@@ -1,20 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.mysql import insert
 
 from app.database import get_db
 from app.schemas.attendance import (
     StudentAttendanceCreate,
+    StudentAttendanceBulkCreate,
     EmployeeAttendanceCreate
 )
 from app.models.student_attendance import StudentAttendance
 from app.models.employee_attendance import EmployeeAttendance
 from app.models.student import Student
 from app.models.employee import Employee
+from app.models.section import Section
 from app.dependencies import admin_or_superadmin
 from app.dependencies import employee_permission_required
+from app.services.dashboard_snapshot import invalidate_dashboard
+from app.services.attendance_rollup import (
+    lock_student_rollup,
+    lock_employee_rollup,
+    refresh_student_rollup,
+    refresh_employee_rollup
+)
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
+def _check_section(db: Session, institute_id: int, class_id: int, section_id):
+    # a client-supplied section must belong to the class being marked,
+    # otherwise the row lands in another class' rollup
+    if section_id and not db.query(Section.id).filter(
+        Section.id == section_id,
+        Section.class_id == class_id,
+        Section.institute_id == institute_id
+    ).first():
+        raise HTTPException(status_code=400, detail="Invalid section for class")
+
+
 @router.post("/students")
 def mark_student_attendance(
     data: StudentAttendanceCreate,
@@ -23,34 +44,151 @@ def mark_student_attendance(
 ):
     student = db.query(Student).filter(
         Student.id == data.student_id,
-        Student.institute_id == user.institute_id,
-        StudentAttendance.institute_id == user.institute_id
+        Student.institute_id == user.institute_id
     ).first()
 
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    record = db.query(StudentAttendance).filter(
+    _check_section(db, user.institute_id, data.class_id, data.section_id)
+
+    section_id = data.section_id or student.section_id
+    if not section_id:
+        raise HTTPException(status_code=400, detail="Student has no section")
+
+    record = db.query(
+        StudentAttendance.class_id,
+        StudentAttendance.section_id
+    ).filter(
         StudentAttendance.student_id == data.student_id,
         StudentAttendance.date == data.date
     ).first()
 
+    # 🔹 rollup keys are locked before the write (see attendance_rollup);
+    # old key too, in case the student moved section
+    keys = [(user.institute_id, data.class_id, section_id, data.date)]
     if record:
-        record.status = data.status
-    else:
-        record = StudentAttendance(
-            student_id=data.student_id,
-            class_id=data.class_id,
-            section_id=data.section_id,
-            institute_id=user.institute_id,
-            date=data.date,
-            status=data.status
-        )
-        db.add(record)
+        keys.append((user.institute_id, record.class_id, record.section_id, data.date))
+    lock_student_rollup(db, keys)
+
+    # upsert on (student_id, date) → two concurrent first marks for the
+    # same student and day cannot hit the unique key
+    stmt = insert(StudentAttendance).values(
+        student_id=data.student_id,
+        class_id=data.class_id,
+        section_id=section_id,
+        institute_id=user.institute_id,
+        date=data.date,
+        status=data.status
+    )
+    stmt = stmt.on_duplicate_key_update(
+        status=stmt.inserted.status,
+        class_id=stmt.inserted.class_id,
+        section_id=stmt.inserted.section_id
+    )
+    db.execute(stmt)
+
+    refresh_student_rollup(db, keys)
 
     db.commit()
+    invalidate_dashboard(user.institute_id)
     return {"message": "Student attendance saved"}
 
+@router.post("/students/bulk")
+def mark_student_attendance_bulk(
+    data: StudentAttendanceBulkCreate,
+    db: Session = Depends(get_db),
+    user=Depends(employee_permission_required("can_attendance"))
+):
+    _check_section(db, user.institute_id, data.class_id, data.section_id)
+
+    # 🔹 1. Validate the whole roll in one query
+    student_ids = {r.student_id for r in data.records}
+
+    students = {
+        s.id: s
+        for s in db.query(Student.id, Student.section_id).filter(
+            Student.id.in_(student_ids),
+            Student.institute_id == user.institute_id,
+            Student.class_id == data.class_id
+        ).all()
+    } if student_ids else {}
+
+    existing = {
+        r.student_id: r
+        for r in db.query(
+            StudentAttendance.student_id,
+            StudentAttendance.class_id,
+            StudentAttendance.section_id
+        ).filter(
+            StudentAttendance.student_id.in_(students.keys()),
+            StudentAttendance.date == data.date
+        ).all()
+    } if students else {}
+
+    # 🔹 2. Build rows + per-row outcome
+    rows = {}
+    results = []
+    for r in data.records:
+        student = students.get(r.student_id)
+        section_id = data.section_id or (student.section_id if student else None)
+
+        if not student:
+            results.append({"student_id": r.student_id, "result": "not_found"})
+            continue
+
+        if not section_id:
+            results.append({"student_id": r.student_id, "result": "no_section"})
+            continue
+
+        if r.student_id in rows:
+            results.append({"student_id": r.student_id, "result": "duplicate"})
+            continue
+
+        rows[r.student_id] = {
+            "student_id": r.student_id,
+            "class_id": data.class_id,
+            "section_id": section_id,
+            "institute_id": user.institute_id,
+            "date": data.date,
+            "status": r.status
+        }
+        results.append({
+            "student_id": r.student_id,
+            "result": "updated" if r.student_id in existing else "created"
+        })
+
+    # 🔹 3. Single multi-row upsert on (student_id, date)
+    if rows:
+        # old keys too, in case a student moved section
+        keys = [
+            (user.institute_id, r["class_id"], r["section_id"], data.date)
+            for r in rows.values()
+        ] + [
+            (user.institute_id, e.class_id, e.section_id, data.date)
+            for sid, e in existing.items() if sid in rows
+        ]
+        lock_student_rollup(db, keys)
+
+        stmt = insert(StudentAttendance).values(list(rows.values()))
+        stmt = stmt.on_duplicate_key_update(
+            status=stmt.inserted.status,
+            class_id=stmt.inserted.class_id,
+            section_id=stmt.inserted.section_id
+        )
+        db.execute(stmt)
+
+        refresh_student_rollup(db, keys)
+        db.commit()
+        invalidate_dashboard(user.institute_id)
+
+    return {
+        "date": data.date,
+        "saved": len(rows),
+        "failed": len(results) - len(rows),
+        "results": results
+    }
+
 @router.post("/employees")
 def mark_employee_attendance(
     data: EmployeeAttendanceCreate,
@@ -70,6 +208,8 @@ def mark_employee_attendance(
         EmployeeAttendance.date == data.date
     ).first()
 
+    lock_employee_rollup(db, user.institute_id, data.date)
+
     if record:
         record.status = data.status
     else:
@@ -81,5 +221,9 @@ def mark_employee_attendance(
         )
         db.add(record)
 
+    db.flush()
+    refresh_employee_rollup(db, user.institute_id, data.date)
+
     db.commit()
+    invalidate_dashboard(user.institute_id)
     return {"message": "Employee attendance saved"}
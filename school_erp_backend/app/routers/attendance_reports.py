@@ -2,77 +2,94 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import date
+from typing import Literal
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.student_attendance import StudentAttendance
 from app.models.employee_attendance import EmployeeAttendance
 from app.models.student import Student
 from app.models.employee import Employee
 from app.dependencies import admin_or_superadmin, employee_permission_required
-from reportlab.platypus import SimpleDocTemplate, Table
+from app.services.attendance_rollup import (
+    month_range,
+    student_totals,
+    employee_totals
+)
+from app.services.report_export import stream_export
+from app.services.report_pdf import (
+    submit_pdf_job,
+    get_pdf_job,
+    wait_pdf_job
+)
 from fastapi.responses import FileResponse
-import tempfile
 
 router = APIRouter(prefix="/attendance-reports", tags=["Attendance Reports"])
 
 
+STUDENT_REPORT_FIELDS = (
+    "student_id",
+    "student_name",
+    "class_name",
+    "section",
+    "date",
+    "status"
+)
+
+
 @router.get("/students")
 def student_attendance_report(
     start_date: date,
     end_date: date,
     class_name:str | None=Query(None),
     section: str | None = Query(None),
-    db: Session = Depends(get_db),
+    format: Literal["json", "csv", "ndjson"] = Query("json"),
+    db: Session = Depends(get_read_db),
     user=Depends(employee_permission_required("can_attendance"))
 ):
-    q = db.query(
-        StudentAttendance.student_id,
-        Student.name,
-        Student.class_name,
-        Student.section,
-        StudentAttendance.date,
-        StudentAttendance.status
-    ).join(Student,
-    Student.id == StudentAttendance.student_id)
+    def build_query(session: Session):
+        q = session.query(
+            StudentAttendance.student_id,
+            Student.name,
+            Student.class_name,
+            Student.section,
+            StudentAttendance.date,
+            StudentAttendance.status
+        ).join(Student,
+        Student.id == StudentAttendance.student_id)
 
-    if user.role != "superadmin":
-        q = q.filter(StudentAttendance.institute_id == user.institute_id)
-    
-    if start_date and end_date:
-        q = q.filter(StudentAttendance.date.between(start_date, end_date))
+        if user.role != "superadmin":
+            q = q.filter(StudentAttendance.institute_id == user.institute_id)
 
-    if class_name:
-        q = q.filter(Student.class_name == class_name)
+        if start_date and end_date:
+            q = q.filter(StudentAttendance.date.between(start_date, end_date))
 
-    if section:
-        q = q.filter(Student.section == section)
+        if class_name:
+            q = q.filter(Student.class_name == class_name)
 
-    q = q.order_by(StudentAttendance.date)
+        if section:
+            q = q.filter(Student.section == section)
 
-    # q = q.filter(
-    #     StudentAttendance.date.between(start_date, end_date)
-    # ).order_by(StudentAttendance.date)
+        return q.order_by(StudentAttendance.date)
 
-    rows = q.all()
+    # 🔹 streamed export (flat memory for long ranges)
+    if format != "json":
+        return stream_export(
+            build_query,
+            STUDENT_REPORT_FIELDS,
+            format,
+            "student_attendance"
+        )
 
-    return [
-        {
-            "student_id": r[0],
-            "student_name": r[1],
-            "class_name": r[2],
-            "section": r[3],
-            "date": r[4],
-            "status": r[5]
-        }
-        for r in rows
-    ]
+    rows = build_query(db).all()
+
+    return [dict(zip(STUDENT_REPORT_FIELDS, r)) for r in rows]
 
 
 @router.get("/employees")
 def employee_attendance_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(admin_or_superadmin)
 ):
     q = db.query(
@@ -108,7 +125,7 @@ def class_wise_report(
     class_name: str = Query(...),
     section: str | None = Query(None),
     date_value: date = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(employee_permission_required("can_attendance"))
 ):
     q = db.query(
@@ -143,22 +160,20 @@ def daily_attendance_report(
     class_id: int,
     section_id: int | None = None,
     report_date: date = date.today(),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(admin_or_superadmin)
 ):
-    q = db.query(StudentAttendance).filter(
-        StudentAttendance.institute_id == user.institute_id,
-        StudentAttendance.class_id == class_id,
-        StudentAttendance.date == report_date
+    totals = student_totals(
+        db,
+        user.institute_id,
+        report_date,
+        report_date,
+        class_id=class_id,
+        section_id=section_id
     )
 
-    if section_id:
-        q = q.filter(StudentAttendance.section_id == section_id)
-
-    records = q.all()
-
-    total = len(records)
-    present = sum(1 for r in records if r.status == "present")
+    total = totals["total"]
+    present = totals["present"]
     absent = total - present
 
     return {
@@ -176,36 +191,21 @@ def monthly_attendance_report(
     class_id: int | None = Query(None),
     section_id: int | None = Query(None),
     month: str = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(admin_or_superadmin)
 ):
-    q = db.query(
-        StudentAttendance.status,
-        func.count(StudentAttendance.id).label("count")
-    ).filter(
-        StudentAttendance.institute_id == user.institute_id,
-        StudentAttendance.class_id == class_id,
-        StudentAttendance.date.like(f"{month}%")
+    start, end = month_range(month)
+
+    result = student_totals(
+        db,
+        user.institute_id,
+        start,
+        end,
+        class_id=class_id,
+        section_id=section_id
     )
 
-    if section_id:
-        q = q.filter(StudentAttendance.section_id == section_id)
-
-    q = q.group_by(StudentAttendance.status)
-
-    rows = q.all()
-
-    # Default values (important!)
-    result = {
-        "present": 0,
-        "absent": 0,
-        "leave": 0
-    }
-
-    for status, count in rows:
-        result[status] = count
-
-    total = sum(result.values())
+    total = result["total"]
 
     return {
         "month": month,
@@ -259,7 +259,7 @@ def student_attendance_snapshot_report(
     section_id: int | None,
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(employee_permission_required("can_attendance"))
 ):
     q = db.query(
@@ -294,7 +294,7 @@ def class_wise_snapshot_report(
     class_id: int,
     section_id: int | None,
     date_value: date,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(employee_permission_required("can_attendance"))
 ):
     q = db.query(
@@ -318,71 +318,113 @@ def class_wise_snapshot_report(
         }
         for r in rows
     ]
-@router.get("/students/pdf")
-def students_attendance_pdf(
-    start_date: date,
-    end_date: date,
-    db: Session = Depends(get_db),
-    user=Depends(admin_or_superadmin)
-):
+def _students_pdf_job(db: Session, user, start_date: date, end_date: date):
     rows = db.query(
         Student.name,
         Student.class_name,
         StudentAttendance.date,
         StudentAttendance.status
-    ).join(Student).filter(
+    ).join(Student, Student.id == StudentAttendance.student_id).filter(
         StudentAttendance.institute_id == user.institute_id,
         StudentAttendance.date.between(start_date, end_date)
-    ).all()
+    ).order_by(StudentAttendance.date).all()
+
+    return submit_pdf_job(
+        user.institute_id,
+        f"students-attendance:{start_date}:{end_date}",
+        f"Student Attendance {start_date} to {end_date}",
+        ["Name", "Class", "Date", "Status"],
+        [[r[0], r[1], str(r[2]), r[3]] for r in rows]
+    )
 
-    file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
 
-    doc = SimpleDocTemplate(file.name)
-    table_data = [["Name", "Class", "Date", "Status"]]
+@router.get("/students/pdf")
+def students_attendance_pdf(
+    start_date: date,
+    end_date: date,
+    db: Session = Depends(get_read_db),
+    user=Depends(admin_or_superadmin)
+):
+    job_id = _students_pdf_job(db, user, start_date, end_date)
 
-    for r in rows:
-        table_data.append([r[0], r[1], str(r[2]), r[3]])
+    # rendering happens in the process pool; this thread only waits
+    try:
+        path = wait_pdf_job(job_id)
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(500, "Report rendering failed")
 
-    doc.build([Table(table_data)])
+    if not path:
+        raise HTTPException(404, "Report not found")
 
-    return FileResponse(file.name, filename="attendance_report.pdf")
-@router.get("/employees/monthly-summary")
-def employee_monthly_summary(
-    month: str = Query(..., description="Format: YYYY-MM"),
-    db: Session = Depends(get_db),
+    return FileResponse(path, filename="attendance_report.pdf")
+
+
+@router.post("/students/pdf/jobs")
+def queue_students_attendance_pdf(
+    start_date: date,
+    end_date: date,
+    db: Session = Depends(get_read_db),
     user=Depends(admin_or_superadmin)
 ):
-    q = db.query(
-        EmployeeAttendance.status,
-        func.count(EmployeeAttendance.id).label("count")
-    )
+    return {"job_id": _students_pdf_job(db, user, start_date, end_date)}
 
-    # institute restriction
-    if user.role != "superadmin":
-        q = q.filter(EmployeeAttendance.institute_id == user.institute_id)
 
-    # month filter
-    q = q.filter(EmployeeAttendance.date.like(f"{month}%"))
+@router.get("/pdf/jobs/{job_id}")
+def pdf_job_status(
+    job_id: str,
+    user=Depends(admin_or_superadmin)
+):
+    job = get_pdf_job(job_id, user.institute_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
 
-    q = q.group_by(EmployeeAttendance.status)
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "error": job["error"]
+    }
 
-    rows = q.all()
 
-    # default result (important for bar chart)
-    result = {
-        "present": 0,
-        "absent": 0,
-        "leave": 0
-    }
+@router.get("/pdf/jobs/{job_id}/download")
+def pdf_job_download(
+    job_id: str,
+    user=Depends(admin_or_superadmin)
+):
+    job = get_pdf_job(job_id, user.institute_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
 
-    for status, count in rows:
-        result[status] = count
+    if job["status"] != "done":
+        raise HTTPException(409, f"Report is {job['status']}")
 
-    total = sum(result.values())
+    path = wait_pdf_job(job_id)
+    if not path:
+        raise HTTPException(404, "Report not found")
+
+    return FileResponse(path, filename="attendance_report.pdf")
+
+
+@router.get("/employees/monthly-summary")
+def employee_monthly_summary(
+    month: str = Query(..., description="Format: YYYY-MM"),
+    db: Session = Depends(get_read_db),
+    user=Depends(admin_or_superadmin)
+):
+    start, end = month_range(month)
+
+    # institute restriction (superadmin sees all)
+    result = employee_totals(
+        db,
+        None if user.role == "superadmin" else user.institute_id,
+        start,
+        end
+    )
 
     return {
         "month": month,
-        "total_entries": total,
+        "total_entries": result["total"],
         "present": result["present"],
         "absent": result["absent"],
         "leave": result["leave"]
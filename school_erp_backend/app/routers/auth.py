@@ -1,22 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, LoginResponse, UserResponse
-from app.security import verify_password, create_access_token
+from app.security import create_access_token
 from app.auth import get_current_user
+from app.services.password_pool import check_password_async
+from app.principal import token_claims
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(data: LoginRequest, db: Session = Depends(get_db)):
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
 
-    user = db.query(User).filter(User.email == data.email).first()
+    user = await db.scalar(
+        select(User).where(User.email == data.email).limit(1)
+    )
+
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # 🔹 bcrypt runs in the login process pool, not on this worker
+    valid, new_hash = await check_password_async(data.password, user.password)
 
-    if not user or not verify_password(data.password, user.password):
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
+
+    # stored hash uses an old cost → upgrade it while we have the password
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
+
     if not user.is_active:
         raise HTTPException(
         status_code=403,
@@ -24,11 +40,8 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
     )
 
 
-    token = create_access_token({
-        "user_id": user.id,
-        "role": user.role,
-        "institute_id": user.institute_id
-    })
+    # employee id + permission bitmask ride in the token
+    token = create_access_token(await db.run_sync(token_claims, user))
 
     return {
         "access_token": token,
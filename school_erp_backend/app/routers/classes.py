@@ -16,6 +16,7 @@ from sqlalchemy import func , case
 from app.models.student import Student
 from app.models.employee import Employee
 from app.routers.fees import calculate_fees_stats
+from app.services.class_stats import load_class_stats
 from app.models.fee_structure import FeeStructure
 
 
@@ -148,108 +149,7 @@ def list_classes(
     db: Session = Depends(get_db),
     user=Depends(get_current_user)
 ):
-    classes = (
-        db.query(SchoolClass)
-        .filter(SchoolClass.institute_id == user.institute_id)
-        .all()
-    )
-
-    response = []
-
-    for cls in classes:
-
-        total_students = (
-            db.query(func.count(Student.id))
-            .filter(Student.class_id == cls.id)
-            .scalar()
-        ) or 0
-
-        boys = (
-            db.query(func.count(Student.id))
-            .filter(
-                Student.class_id == cls.id,
-                Student.gender == "male"
-            )
-            .scalar()
-        ) or 0
-
-        girls = (
-            db.query(func.count(Student.id))
-            .filter(
-                Student.class_id == cls.id,
-                Student.gender == "female"
-            )
-            .scalar()
-        ) or 0
-
-        boys_percent = round((boys / total_students) * 100) if total_students else 0
-        girls_percent = round((girls / total_students) * 100) if total_students else 0
-
-        # 🟣 CASTE STATS (CLASS LEVEL)
-        caste_rows = (
-            db.query(
-                Student.caste,
-                func.count(Student.id)
-            )
-            .filter(Student.class_id == cls.id)
-            .group_by(Student.caste)
-            .all()
-        )
-
-        caste_stats = {
-            caste: round((count / total_students) * 100)
-            for caste, count in caste_rows
-        } if total_students else {}
-
-        fees_stats = calculate_fees_stats(
-            db=db,
-            institute_id=user.institute_id,
-            class_id=cls.id
-        )
-
-
-        # 🟢 SECTIONS (SUMMARY ONLY, NO STUDENTS)
-        sections = (
-            db.query(Section)
-            .filter(Section.class_id == cls.id)
-            .all()
-        )
-
-        section_list = []
-        for sec in sections:
-            sec_total = (
-                db.query(func.count(Student.id))
-                .filter(
-                    Student.class_id == cls.id,
-                    Student.section == sec.name
-                )
-                .scalar()
-            ) or 0
-
-            section_list.append({
-                "id": sec.id,
-                "name": sec.name,
-                "total": sec_total
-            })
-
-        response.append({
-            "id": cls.id,
-            "name": cls.name,
-            "class_coordinator_name": (
-    db.query(Employee.name)
-    .filter(Employee.id == cls.class_coordinator_id)
-    .scalar()
-),
-            "students_count": total_students,
-            "boys_percent": boys_percent,
-            "girls_percent": girls_percent,
-            "caste_stats": caste_stats,
-            "fees_stats": fees_stats,
-            "sections": section_list,
-            "sections_count": len(section_list)
-        })
-
-    return response
+    return load_class_stats(db, user.institute_id)
 
 @router.post("/sections", response_model=SectionResponse)
 def add_section(
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 
-from app.database import get_db
+from app.database import get_read_db, get_async_db
 from app.auth import get_current_user
 from app.models.student import Student
 from app.models.employee import Employee
@@ -12,59 +13,37 @@ from app.models.student_fee import StudentFee
 from app.models.exam import Exam
 from app.models.homework import Homework
 from app.models.class_model import SchoolClass
+from app.services.dashboard_snapshot import get_snapshot
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+
 @router.get("/admin")
-def admin_dashboard(
-    db: Session = Depends(get_db),
+async def admin_dashboard(
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user)
 ):
     if user.role not in ["admin", "superadmin"]:
         return {"detail": "Forbidden"}
 
-    today = date.today()
+    # primary, not the replica: a recompute right after a write fills
+    # the cache and must already see that write
+    snapshot = await db.run_sync(get_snapshot, user.institute_id)
 
     return {
-        "students": db.query(Student).filter(
-            Student.institute_id == user.institute_id
-        ).count(),
-
-        "employees": db.query(Employee).filter(
-            Employee.institute_id == user.institute_id
-        ).count(),
-
-        "student_attendance_today": db.query(StudentAttendance).filter(
-            StudentAttendance.institute_id == user.institute_id,
-            StudentAttendance.date == today,
-            StudentAttendance.status == "present"
-        ).count(),
-
-        "employee_attendance_today": db.query(EmployeeAttendance).filter(
-            EmployeeAttendance.institute_id == user.institute_id,
-            EmployeeAttendance.date == today,
-            EmployeeAttendance.status == "present"
-        ).count(),
-
-        "fee_defaulters": db.query(StudentFee).filter(
-            StudentFee.institute_id == user.institute_id,
-            StudentFee.is_paid == False
-        ).count(),
-
-        "exams": db.query(Exam).filter(
-            Exam.institute_id == user.institute_id
-        ).count(),
-
-        "active_homework": db.query(Homework).filter(
-            Homework.institute_id == user.institute_id,
-            Homework.due_date >= today
-        ).count()
+        "students": snapshot["students"],
+        "employees": snapshot["employees"],
+        "student_attendance_today": snapshot["student_attendance_today"],
+        "employee_attendance_today": snapshot["employee_attendance_today"],
+        "fee_defaulters": snapshot["fee_defaulters"],
+        "exams": snapshot["exams"],
+        "active_homework": snapshot["active_homework"]
     }
 
 
 @router.get("/employee")
 def employee_dashboard(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     if user.role != "employee":
@@ -98,7 +77,7 @@ def employee_dashboard(
 
 @router.get("/student")
 def student_dashboard(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     if user.role != "student":
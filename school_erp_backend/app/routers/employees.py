@@ -2,14 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.auth import get_current_user
+from app.auth import get_token_user
 from app.models.employee import Employee
 from app.models.employee_permission import EmployeePermission
 from app.schemas.employee import EmployeeCreate, EmployeeResponse, PermissionUpdate,EmployeeCreateResponse,EmployeeListResponse
 from app.dependencies import admin_or_superadmin
 from app.models.user import User
 from app.security import hash_password
-from app.schemas.employee_login import EmployeeLoginCreate
+from app.schemas.employee_login import EmployeeLoginCreate, BulkEmployeeLoginCreate
 from app.models.employee_form_field import EmployeeFormField
 from app.models.employee_extra_data import EmployeeExtraData
 from app.schemas.employee_form_schema import EmployeeFormFieldCreate
@@ -19,6 +19,10 @@ from app.schemas.employee_role_schema import (
     EmployeeRoleCreate,
     EmployeeRoleResponse
 )
+from app.services.user_logins import load_logins
+from app.services.dashboard_snapshot import invalidate_dashboard
+from app.principal import invalidate_principal, bump_token_version
+from app.services.login_provisioning import provision_logins
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
@@ -56,6 +60,7 @@ def add_employee(
     perms = EmployeePermission(employee_id=employee.id)
     db.add(perms)
     db.commit()
+    invalidate_dashboard(user.institute_id)
 
     return employee
 
@@ -90,16 +95,19 @@ def list_employees(
 
     employees = q.all()
 
+    logins = load_logins(db, [emp.user_id for emp in employees])
+
     result = []
     for emp in employees:
+        login = logins.get(emp.user_id)
         result.append({
             "id": emp.id,
             "name": emp.name,
             "designation": emp.designation,
             "phone": emp.phone,
             "has_login": emp.user_id is not None,
-            "login_email": emp.user.email if emp.user else None,
-            "is_active": emp.user.is_active if emp.user else False
+            "login_email": login.email if login else None,
+            "is_active": login.is_active if login else False
         })
 
     return result
@@ -127,19 +135,18 @@ def update_permissions(
     for field, value in data.dict().items():
         setattr(perms, field, value)
 
+    # tokens carry the old permission bits → force a fresh login
+    bump_token_version(db, employee.user_id)
     db.commit()
+    invalidate_principal(employee.user_id)
     return {"message": "Permissions updated"}
 
-def attendance_access(user=Depends(get_current_user), db=Depends(get_db)):
+def attendance_access(user=Depends(get_token_user), db=Depends(get_db)):
     if user.role == "admin":
         return user
 
     if user.role == "employee":
-        perms = db.query(EmployeePermission).filter(
-            EmployeePermission.employee_id == user.employee.id
-        ).first()
-
-        if not perms.can_attendance:
+        if not user.has_permission("can_attendance"):
             raise HTTPException(status_code=403)
 
         return user
@@ -185,6 +192,24 @@ def create_employee_login(
         "email": new_user.email
     }
 
+@router.post("/logins/bulk")
+def create_employee_logins_bulk(
+    data: BulkEmployeeLoginCreate,
+    db: Session = Depends(get_db),
+    user=Depends(admin_or_superadmin)
+):
+    # passwords are hashed in a process pool, users inserted in one batch
+    return provision_logins(
+        db,
+        Employee,
+        "employee",
+        user.institute_id,
+        [
+            {"id": l.employee_id, "email": l.email, "password": l.password}
+            for l in data.logins
+        ]
+    )
+
 @router.put("/{employee_id}/toggle-login")
 def toggle_employee_login(
     employee_id: int,
@@ -201,6 +226,7 @@ def toggle_employee_login(
 
     employee.user.is_active = not employee.user.is_active
     db.commit()
+    invalidate_principal(employee.user_id)
 
     return {
         "message": "Login status updated",
@@ -224,6 +250,7 @@ def change_employee_password(
 
     employee.user.password = hash_password(data.password)
     db.commit()
+    invalidate_principal(employee.user_id)
 
     return {"message": "Password updated"}
 @router.get("/{employee_id}/permissions", dependencies=[Depends(admin_or_superadmin)])
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.mysql import insert
+import csv
+import io
 
 from app.database import get_db
 from app.models.exam import Exam
+from app.services.dashboard_snapshot import invalidate_dashboard
 from app.models.exam_subject import ExamSubject
 from app.models.exam_mark import ExamMark
 from app.models.class_model import SchoolClass
@@ -10,7 +14,8 @@ from app.models.student import Student
 from app.schemas.exam_schema import (
     ExamCreate,
     ExamResponse,
-    ExamMarkCreate
+    ExamMarkCreate,
+    ExamMarksMatrix
 )
 from app.schemas.exam_schedule_schema import(
     ExamScheduleCreate,
@@ -107,6 +112,7 @@ def create_exam(
     db.add(exam)
     db.commit()
     db.refresh(exam)
+    invalidate_dashboard(user.institute_id)
 
     return exam
 
@@ -151,6 +157,158 @@ def add_exam_marks(
     db.commit()
     return {"message": "Marks saved"}
 
+MARKS_UPSERT_BATCH = 500
+
+
+def save_marks_matrix(db: Session, exam_id: int, institute_id: int, subject_ids, rows):
+    exam = db.query(Exam.id).filter(
+        Exam.id == exam_id,
+        Exam.institute_id == institute_id
+    ).first()
+
+    if not exam:
+        raise HTTPException(404, "Exam not found")
+
+    # 🔹 1. Set-wise membership checks
+    valid_subjects = {
+        sid for (sid,) in db.query(Subject.id).filter(
+            Subject.id.in_(subject_ids),
+            Subject.institute_id == institute_id
+        ).all()
+    } if subject_ids else set()
+
+    student_ids = {r["student_id"] for r in rows}
+    valid_students = {
+        sid for (sid,) in db.query(Student.id).filter(
+            Student.id.in_(student_ids),
+            Student.institute_id == institute_id
+        ).all()
+    } if student_ids else set()
+
+    errors = [
+        {"subject_id": sid, "error": "Subject not found"}
+        for sid in subject_ids if sid not in valid_subjects
+    ]
+
+    # 🔹 2. Flatten the grid
+    values = {}
+    for row in rows:
+        student_id = row["student_id"]
+        if student_id not in valid_students:
+            errors.append({"student_id": student_id, "error": "Student not found"})
+            continue
+
+        if len(row["marks"]) != len(subject_ids):
+            errors.append({"student_id": student_id, "error": "Column count mismatch"})
+            continue
+
+        for subject_id, marks in zip(subject_ids, row["marks"]):
+            if marks is None or subject_id not in valid_subjects:
+                continue
+            values[(student_id, subject_id)] = {
+                "exam_id": exam_id,
+                "student_id": student_id,
+                "subject_id": subject_id,
+                "marks": marks
+            }
+
+    # 🔹 3. Batched upserts, one transaction
+    values = list(values.values())
+    for i in range(0, len(values), MARKS_UPSERT_BATCH):
+        stmt = insert(ExamMark).values(values[i:i + MARKS_UPSERT_BATCH])
+        stmt = stmt.on_duplicate_key_update(marks=stmt.inserted.marks)
+        db.execute(stmt)
+
+    db.commit()
+
+    return {
+        "message": "Marks saved",
+        "saved": len(values),
+        "errors": errors
+    }
+
+
+def parse_marks_csv(db: Session, institute_id: int, content: bytes):
+    """
+    Header: student_id,<subject>,<subject>,...
+    Subject columns may be subject ids or subject names.
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(400, "CSV must be UTF-8")
+
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+
+    if not header or header[0].strip().lower() != "student_id":
+        raise HTTPException(400, "First column must be student_id")
+
+    columns = [h.strip() for h in header[1:]]
+    names = [c for c in columns if not c.isdigit()]
+
+    by_name = {
+        name.lower(): sid
+        for sid, name in db.query(Subject.id, Subject.name).filter(
+            Subject.institute_id == institute_id,
+            Subject.name.in_(names)
+        ).all()
+    } if names else {}
+
+    subject_ids = []
+    for c in columns:
+        if c.isdigit():
+            subject_ids.append(int(c))
+        elif c.lower() in by_name:
+            subject_ids.append(by_name[c.lower()])
+        else:
+            raise HTTPException(400, f"Unknown subject column: {c}")
+
+    rows = []
+    for line_no, line in enumerate(reader, start=2):
+        if not line or not line[0].strip():
+            continue
+        try:
+            rows.append({
+                "student_id": int(line[0]),
+                "marks": [
+                    int(v) if v.strip() else None
+                    for v in line[1:]
+                ]
+            })
+        except ValueError:
+            raise HTTPException(400, f"Invalid number on line {line_no}")
+
+    return subject_ids, rows
+
+
+@router.post("/{exam_id}/marks/bulk")
+def add_exam_marks_bulk(
+    exam_id: int,
+    data: ExamMarksMatrix,
+    db: Session = Depends(get_db),
+    user=Depends(employee_permission_required("can_exams"))
+):
+    return save_marks_matrix(
+        db,
+        exam_id,
+        user.institute_id,
+        data.subject_ids,
+        [r.dict() for r in data.rows]
+    )
+
+
+@router.post("/{exam_id}/marks/bulk/csv")
+def add_exam_marks_csv(
+    exam_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    user=Depends(employee_permission_required("can_exams"))
+):
+    content = file.file.read()
+    subject_ids, rows = parse_marks_csv(db, user.institute_id, content)
+    return save_marks_matrix(db, exam_id, user.institute_id, subject_ids, rows)
+
 @router.post("/{exam_id}/schedule")
 def create_exam_schedule(
     exam_id: int,
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Literal
 from sqlalchemy import text
 
 from app.database import get_db
@@ -9,6 +10,7 @@ from app.models.student import Student
 from app.dependencies import employee_permission_required
 from app.models.fee_structure import FeeStructure
 from app.models.fee_payment import FeePayment
+from app.services.dashboard_snapshot import invalidate_dashboard
 from app.schemas.fees_schema import (
     FeeStructureCreate,
     GenerateFee,
@@ -20,6 +22,8 @@ from app.models.fee_fine_rule import FeeFineRule
 from app.models.fee_structure import FeeStructure
 from app.dependencies import admin_or_superadmin
 from app.utils.fee_fine_calculator import calculate_fine
+from app.services.class_stats import build_fees_stats
+from app.services.fee_defaulters import list_defaulters, defaulters_summary
 
 
 router = APIRouter(prefix="/fees", tags=["Fees"])
@@ -115,6 +119,7 @@ def generate_student_fee(
     db.add(sf)
     db.commit()
     db.refresh(sf)
+    invalidate_dashboard(user.institute_id)
     return {"total_amount": total,"student_fee_id":sf.id}
 
 @router.post("/collect")
@@ -169,6 +174,7 @@ def collect_fee(
 
     db.add(payment)
     db.commit()
+    invalidate_dashboard(user.institute_id)
     return {
         "message": "Fee collected",
         "fine_applied": fine_amount,
@@ -179,34 +185,30 @@ def collect_fee(
 
 @router.get("/defaulters")
 def fee_defaulters(
+    class_id: int | None = None,
+    section_id: int | None = None,
+    sort: Literal["due_desc", "due_asc"] = "due_desc",
+    after_due: int | None = None,
+    after_id: int | None = None,
+    limit: int | None = Query(None, ge=1, le=500),
+    summary: bool = False,
     db: Session = Depends(get_db),
     user=Depends(employee_permission_required("can_fees"))
 ):
-    # return db.query(StudentFee).filter(
-    #     StudentFee.is_paid == False,
-    #     StudentFee.institute_id == user.institute_id
-    # ).all()
-    defaulters = db.query(StudentFee).filter(
-    StudentFee.is_paid == False,
-    StudentFee.institute_id == user.institute_id
-    ).all()
-
-    result = []
-
-    for sf in defaulters:
-        student = db.query(Student).filter(Student.id == sf.student_id).first()
-
-        total_payable = sf.total_amount + sf.fine_amount
-        due_amount = total_payable - sf.paid_amount
-
-        result.append({
-        "name": student.name,
-        "class": student.class_name,
-        "section": student.section,
-        "due_amount": due_amount
-        })
-
-    return result
+    # 🔹 dashboard mode: count + due per class
+    if summary:
+        return defaulters_summary(db, user.institute_id, class_id, section_id)
+
+    return list_defaulters(
+        db,
+        user.institute_id,
+        class_id=class_id,
+        section_id=section_id,
+        sort=sort,
+        after_due=after_due,
+        after_id=after_id,
+        limit=limit
+    )
 
 @router.get("/invoice/{student_fee_id}")
 def fee_invoice_preview(
@@ -485,17 +487,4 @@ def calculate_fees_stats(db, institute_id, class_id=None, section=None):
         }
     ).fetchone()
 
-    total = q.total or 0
-    paid = q.paid or 0
-    pending = max(total - paid, 0)
-
-    def pct(x):
-        return round((x / total) * 100, 1) if total else 0
-
-    return {
-        "total": total,
-        "paid": paid,
-        "pending": pending,
-        "paid_percent": pct(paid),
-        "pending_percent": pct(pending)
-    }
+    return build_fees_stats(q.total, q.paid)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.homework import Homework
+from app.services.dashboard_snapshot import invalidate_dashboard
 from app.schemas.homework_schema import HomeworkCreate, HomeworkResponse
 from app.dependencies import employee_permission_required
 from app.auth import get_current_user
@@ -42,6 +43,7 @@ def add_homework(
     db.add(hw)
     db.commit()
     db.refresh(hw)
+    invalidate_dashboard(user.institute_id)
     return hw
 
 # @router.get("/", response_model=list[HomeworkResponse])
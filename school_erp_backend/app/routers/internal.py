@@ -0,0 +1,22 @@
+import os
+
+from fastapi import APIRouter, Depends, Request
+
+from app.database import pool_metrics
+from app.dependencies import superadmin_only
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+@router.get("/db-pool")
+def db_pool_metrics(user=Depends(superadmin_only)):
+    return pool_metrics()
+
+
+@router.get("/boot")
+def boot_metrics(request: Request, user=Depends(superadmin_only)):
+    # per worker: hit repeatedly to sample every process
+    return {
+        "pid": os.getpid(),
+        "boot_ms": getattr(request.app.state, "boot_ms", None)
+    }
@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, select
 from typing import List, Optional
+from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.auth import get_current_user
 from app.models.message import Message, MessageAttachment
 from app.schemas.MessageResponse import MessageResponse
-from app.utils.file_upload import save_message_file
+from app.utils.file_upload import save_message_file, resolve_stored_file
 from app.models.class_model import SchoolClass
 from app.models.section import Section
 from app.models.student import Student
 from app.models.employee import Employee
 from app.models.user import User
+from app.services.message_delivery import (
+    audience_filter,
+    read_message_ids,
+    record_receipt
+)
 
 router = APIRouter(prefix="/messages", tags=["Messaging"])
 
@@ -181,6 +189,14 @@ def send_message(
         raise HTTPException(400, "Invalid send_scope")
 
 
+    # -------- STORE FILES --------
+    # before the message row, so a rejected upload leaves nothing behind
+    saved_files = [
+        save_message_file(file)
+        for file in files or []
+        if file.filename
+    ]
+
     # -------- CREATE MESSAGE --------
     new_message = Message(
         sender_id=current_user.id,
@@ -194,55 +210,68 @@ def send_message(
     )
 
     db.add(new_message)
-    db.commit()
-    db.refresh(new_message)
+    db.flush()
 
     # -------- ATTACHMENTS --------
-    if files:
-        for file in files:
-            if not file.filename:
-                continue
-            saved = save_message_file(file)
-            attachment = MessageAttachment(
-                message_id=new_message.id,
-                file_name=saved["file_name"],
-                file_path=saved["file_path"],
-                file_type=saved["file_type"]
-            )
-            db.add(attachment)
-        db.commit()
+    for saved in saved_files:
+        db.add(MessageAttachment(
+            message_id=new_message.id,
+            file_name=saved["file_name"],
+            file_path=saved["file_path"],
+            file_type=saved["file_type"],
+            content_hash=saved["content_hash"],
+            file_size=saved["file_size"]
+        ))
+
+    db.commit()
+    db.refresh(new_message)
 
     return new_message
 
 
 # ===================== INBOX =====================
 @router.get("/inbox", response_model=List[MessageResponse])
-def inbox(
-    db: Session = Depends(get_db),
+async def inbox(
+    before_created_at: datetime | None = None,
+    before_id: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
-    q = db.query(Message).filter(
-        Message.institute_id == current_user.institute_id,
-        Message.receiver_role == current_user.role,
-        or_(
-            Message.receiver_id == None,
-            Message.receiver_id == current_user.id
-        )
-    )
-
-    # category-based delivery (teachers)
-    if current_user.role == "employee":
-        q = q.filter(
-            or_(
-                Message.category == None,
-                Message.category == current_user.employee.designation,
+    q = select(Message).where(audience_filter(current_user))
+
+    # cursor = (created_at, id) of the last message on the previous page
+    if before_created_at is not None and before_id is not None:
+        q = q.where(or_(
+            Message.created_at < before_created_at,
+            and_(
+                Message.created_at == before_created_at,
+                Message.id < before_id
+            )
+        ))
 
-        )
+    # attachments for the whole page come from one extra IN query
+    result = await db.scalars(
+        q.options(selectinload(Message.attachments))
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .limit(limit)
     )
+    page = result.all()
 
+    # per-user read state from receipts (one indexed IN query)
+    read_ids = set()
+    if page:
+        read_ids = set((await db.scalars(
+            read_message_ids([m.id for m in page], current_user.id)
+        )).all())
 
+    response = []
+    for m in page:
+        item = MessageResponse.model_validate(m)
+        item.is_read = m.id in read_ids
+        response.append(item)
 
-    return q.order_by(Message.created_at.desc()).all()
+    return response
 
 
 # ===================== MARK READ =====================
@@ -252,15 +281,68 @@ def mark_read(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    msg = db.query(Message).filter(
+    msg = db.query(Message.id).filter(
         Message.id == message_id,
-        Message.institute_id == current_user.institute_id
+        audience_filter(current_user)
     ).first()
 
     if not msg:
         raise HTTPException(404, "Message not found")
 
-    msg.is_read = True
+    # receipt per reader; a broadcast stays unread for everyone else
+    record_receipt(db, message_id, current_user.id)
     db.commit()
 
     return {"status": "read"}
+
+
+# ===================== ATTACHMENT DOWNLOAD =====================
+ATTACHMENT_CACHE_CONTROL = "private, max-age=86400"
+
+
+@router.get("/attachments/{attachment_id}")
+async def download_attachment(
+    attachment_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+):
+    # visible to recipients, the sender and the institute admin
+    access = [audience_filter(current_user), Message.sender_id == current_user.id]
+    if current_user.role == "admin":
+        access.append(Message.institute_id == current_user.institute_id)
+
+    attachment = await db.scalar(
+        select(MessageAttachment)
+        .join(Message, Message.id == MessageAttachment.message_id)
+        .where(MessageAttachment.id == attachment_id, or_(*access))
+    )
+
+    if not attachment:
+        raise HTTPException(404, "Attachment not found")
+
+    stored = resolve_stored_file(attachment.file_path)
+    if not stored:
+        raise HTTPException(404, "File missing")
+
+    path, stat = stored
+
+    # content-addressed files never change → the hash is a strong ETag
+    etag = '"{}"'.format(
+        attachment.content_hash or f"{int(stat.st_mtime):x}-{stat.st_size:x}"
+    )
+    headers = {"ETag": etag, "Cache-Control": ATTACHMENT_CACHE_CONTROL}
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    # FileResponse handles Range / If-Range / Last-Modified and uses
+    # the server's sendfile path (pathsend) when available
+    return FileResponse(
+        path,
+        media_type=attachment.file_type,
+        filename=attachment.file_name,
+        content_disposition_type="inline",
+        headers=headers,
+        stat_result=stat
+    )
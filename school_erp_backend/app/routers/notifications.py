@@ -19,33 +19,37 @@
 #     ).order_by(Message.created_at.desc()).limit(10).all()
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.auth import get_current_user
 from app.models.message import Message
+from app.services.message_delivery import unread_filter
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
 @router.get("/unread")
-def unread_notifications(
-    db: Session = Depends(get_db),
+async def unread_notifications(
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
-    query = db.query(Message).filter(
-        Message.receiver_role == current_user.role,
-        Message.is_read == False
+    result = await db.scalars(
+        select(Message)
+        .where(unread_filter(current_user))
+        .order_by(Message.created_at.desc())
+        .limit(10)
     )
+    return result.all()
 
-    # 👇 only filter institute if user has one
-    if current_user.institute_id:
-        query = query.filter(
-            Message.institute_id == current_user.institute_id
-        )
 
-    return (
-        query
-        .order_by(Message.created_at.desc())
-        .limit(10)
-        .all()
+@router.get("/unread/count")
+async def unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+):
+    # inbox index range + one receipt key lookup per candidate message
+    count = await db.scalar(
+        select(func.count(Message.id)).where(unread_filter(current_user))
     )
+    return {"unread": count}
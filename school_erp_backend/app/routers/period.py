@@ -4,6 +4,7 @@ from app.database import get_db
 from app.models.period import Period
 from app.schemas.period_schema import PeriodCreate, PeriodResponse
 from app.dependencies import admin_or_superadmin
+from app.services.timetable_pdf import bump_timetable_version
 
 router = APIRouter(prefix="/periods", tags=["Periods"])
 
@@ -19,6 +20,7 @@ def add_period(
     )
     db.add(p)
     db.commit()
+    bump_timetable_version(user.institute_id)
     db.refresh(p)
     return p
 
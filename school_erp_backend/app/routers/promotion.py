@@ -1,3 +1,5 @@
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -6,9 +8,11 @@ from app.models.student import Student
 from app.models.class_model import SchoolClass
 from app.models.promotion_log import PromotionLog
 from app.dependencies import admin_or_superadmin
-from app.schemas.promotion_schema import PromoteStudent
+from app.schemas.promotion_schema import PromoteStudent, PromoteClasses
 from app.models.section import Section
-from app.models.student_fee import StudentFee
+from app.principal import invalidate_principal, clear_principals
+from app.services.promotion_engine import promote_ids, promote_classes
+from app.services.student_search import drop_search_index, bump_search_version
 
 router = APIRouter(prefix="/promotion", tags=["Promotion"])
 
@@ -32,14 +36,14 @@ def promote_students(
             Section.class_id == data.to_class_id
     ).first()
 
-    if not section:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid section for target class"
-        )
+        if not section:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid section for target class"
+            )
 
 
-    students = db.query(Student).filter(
+    students = db.query(Student.id, Student.user_id).filter(
         Student.id.in_(data.student_ids),
         Student.institute_id == user.institute_id
     ).all()
@@ -47,37 +51,49 @@ def promote_students(
     if not students:
         raise HTTPException(status_code=404, detail="No students found")
 
+    # one log INSERT … SELECT + one UPDATE for the whole selection
+    promote_ids(db, [s.id for s in students], cls, data.to_section)
+    bump_search_version(db, user.institute_id)
+    db.commit()
 
+    # cached principals carry class_id (class broadcasts)
     for student in students:
-        log = PromotionLog(
-            student_id=student.id,
-            from_class=student.class_name,
-            to_class=cls.name,
-            from_section=student.section,
-            to_section=data.to_section,
-            institute_id=user.institute_id
-        )
-        db.add(log)
-
-        if (
-            student.class_id == data.to_class_id and
-            student.section == data.to_section
-):
-            continue
+        invalidate_principal(student.user_id)
 
-        student.class_id = data.to_class_id
-        student.class_name = cls.name
-        student.section = data.to_section
+    # class / section changed for many rows → rebuild on next search
+    drop_search_index(user.institute_id)
 
-        db.query(StudentFee).filter(
-            StudentFee.student_id == student.id,
-            StudentFee.institute_id == user.institute_id,
-            StudentFee.is_paid == False
-).update({"is_paid": False})
+    return {"message": "Students promoted successfully"}
 
 
-    db.commit()
-    return {"message": "Students promoted successfully"}
+# ===================== YEAR-END ROLLOVER =====================
+@router.post("/bulk")
+def promote_classes_bulk(
+    data: PromoteClasses,
+    db: Session = Depends(get_db),
+    user=Depends(admin_or_superadmin)
+):
+    batch_id = data.batch_id or uuid.uuid4().hex
+
+    results = promote_classes(
+        db,
+        user.institute_id,
+        [m.dict() for m in data.mappings],
+        batch_id,
+        dry_run=data.dry_run,
+        chunk_size=data.chunk_size
+    )
+
+    if not data.dry_run:
+        clear_principals()
+        drop_search_index(user.institute_id)
+
+    return {
+        "batch_id": batch_id,
+        "dry_run": data.dry_run,
+        "students": sum(r["students"] for r in results),
+        "classes": results
+    }
 
 # @router.get("/history")
 # def promotion_history(
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Literal
 
-from app.database import get_db
+from app.database import get_read_db
 from app.auth import get_current_user
 from app.models.student_attendance import StudentAttendance
 from app.models.employee_attendance import EmployeeAttendance
@@ -13,6 +14,8 @@ from app.models.subject import Subject
 from app.models.student_fee import StudentFee
 from app.models.fee_payment import FeePayment
 from app.models.salary_payment import SalaryPayment
+from app.services.report_export import stream_export
+from app.services.fee_defaulters import list_defaulters, defaulters_summary
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -21,25 +24,37 @@ router = APIRouter(prefix="/reports", tags=["Reports"])
 def student_attendance_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
-    db: Session = Depends(get_db),
+    format: Literal["json", "csv", "ndjson"] = Query("json"),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
-    return db.query(
-        Student.name,
-        StudentAttendance.date,
-        StudentAttendance.status
-    ).join(
-        Student, Student.id == StudentAttendance.student_id
-    ).filter(
-        StudentAttendance.institute_id == user.institute_id,
-        StudentAttendance.date.between(start_date, end_date)
-    ).all()
+    def build_query(session: Session):
+        return session.query(
+            Student.name,
+            StudentAttendance.date,
+            StudentAttendance.status
+        ).join(
+            Student, Student.id == StudentAttendance.student_id
+        ).filter(
+            StudentAttendance.institute_id == user.institute_id,
+            StudentAttendance.date.between(start_date, end_date)
+        )
+
+    if format != "json":
+        return stream_export(
+            build_query,
+            ("name", "date", "status"),
+            format,
+            "student_attendance"
+        )
+
+    return build_query(db).all()
 
 @router.get("/attendance/employees")
 def employee_attendance_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     return db.query(
@@ -55,7 +70,7 @@ def employee_attendance_report(
 def exam_result_report(
     exam_id: int,
     class_name: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     return db.query(
@@ -76,7 +91,7 @@ def exam_result_report(
 def fee_collection_report(
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     return db.query(FeePayment).filter(
@@ -86,19 +101,35 @@ def fee_collection_report(
 
 @router.get("/fees/defaulters")
 def fee_defaulters_report(
-    db: Session = Depends(get_db),
+    class_id: int | None = None,
+    section_id: int | None = None,
+    sort: Literal["due_desc", "due_asc"] = "due_desc",
+    after_due: int | None = None,
+    after_id: int | None = None,
+    limit: int | None = Query(None, ge=1, le=500),
+    summary: bool = False,
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
-    return db.query(StudentFee).filter(
-        StudentFee.institute_id == user.institute_id,
-        StudentFee.is_paid == False
-    ).all()
+    if summary:
+        return defaulters_summary(db, user.institute_id, class_id, section_id)
+
+    return list_defaulters(
+        db,
+        user.institute_id,
+        class_id=class_id,
+        section_id=section_id,
+        sort=sort,
+        after_due=after_due,
+        after_id=after_id,
+        limit=limit
+    )
 
 @router.get("/salary")
 def salary_report(
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     return db.query(SalaryPayment).filter(
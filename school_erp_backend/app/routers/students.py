@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session,relationship
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.student import Student
 from app.schemas.student import StudentCreate, StudentResponse,StudentDetailResponse
 from app.dependencies import admin_or_superadmin,employee_permission_required
 from app.auth import get_current_user
-from app.schemas.student_login_schema import StudentLoginCreate
+from app.schemas.student_login_schema import StudentLoginCreate, BulkStudentLoginCreate
 from app.models.user import User
 from app.security import hash_password
 from app.models.student_form_config import StudentFormConfig
@@ -21,6 +23,20 @@ from app.security import hash_password
 from app.schemas.student_login_schema import StudentPasswordUpdate
 from app.models.student_form_field import StudentFormField
 from app.schemas.student_form_schema import StudentFormFieldCreate
+from app.services.user_logins import load_logins
+from app.principal import invalidate_principal
+from app.services.dashboard_snapshot import invalidate_dashboard
+from app.services.student_search import (
+    search_student_ids,
+    search_students as search_index,
+    index_student,
+    unindex_student,
+    drop_search_index,
+    bump_search_version,
+    INDEX_MIN_QUERY_LENGTH
+)
+from app.services.student_import import import_students
+from app.services.login_provisioning import provision_logins
 
 
 
@@ -60,8 +76,11 @@ def add_student(
     )
 
     db.add(student)
+    version = bump_search_version(db, institute_id)
     db.commit()
     db.refresh(student)
+    invalidate_dashboard(institute_id)
+    index_student(student, version)
 
 
     cls = db.query(SchoolClass).filter(
@@ -148,11 +167,36 @@ def add_student(
 
 #     return result
 
+# ===================== BULK IMPORT =====================
+@router.post("/import")
+def import_students_file(
+    file: UploadFile = File(...),
+    dry_run: bool = Query(False),
+    db: Session = Depends(get_db),
+    user=Depends(admin_or_superadmin)
+):
+    """CSV / XLSX with a header row; returns a per-row error report."""
+    report = import_students(
+        db,
+        user.institute_id,
+        file.filename,
+        file.file,
+        dry_run=dry_run
+    )
+
+    if not dry_run and report["imported"]:
+        invalidate_dashboard(user.institute_id)
+        drop_search_index(user.institute_id)
+
+    return report
+
 @router.get("/")
 def list_students(
     class_name: str | None = None,
     section: str | None = None,
     search: str | None = None,
+    after_id: int | None = None,
+    limit: int | None = Query(None, ge=1, le=500),
     db: Session = Depends(get_db),
     user=Depends(admin_or_superadmin)
 ):
@@ -167,21 +211,38 @@ def list_students(
     if class_name:
         q = q.filter(Student.class_name == class_name)
 
-    if search:
+    # 🔹 1–2 chars: plain substring match, as before the index
+    if search and len(search.strip()) < INDEX_MIN_QUERY_LENGTH:
+        term = f"%{search.strip()}%"
         q = q.filter(
-            Student.name.ilike(f"%{search}%") |
-            Student.admission_no.ilike(f"%{search}%")
+            Student.name.ilike(term) |
+            Student.admission_no.ilike(term)
         )
-    if search:
-        q = q.filter(Student.name.ilike(f"%{search}%"))
+
+    # 🔹 longer: in-memory index, not a LIKE '%q%' scan
+    elif search:
+        ids = search_student_ids(db, user.institute_id, search, limit=None)
+        if not ids:
+            return []
+        q = q.filter(Student.id.in_(ids))
+
+    # 🔹 keyset pagination (admin grid)
+    if after_id or limit:
+        q = q.order_by(Student.id)
+
+    if after_id:
+        q = q.filter(Student.id > after_id)
+
+    if limit:
+        q = q.limit(limit)
 
     students = q.all()
 
+    logins = load_logins(db, [s.user_id for s in students])
+
     result = []
     for s in students:
-        user_obj = None
-        if s.user_id:
-            user_obj = db.query(User).filter(User.id == s.user_id).first()
+        user_obj = logins.get(s.user_id)
 
         result.append({
             "id": s.id,
@@ -196,16 +257,16 @@ def list_students(
     return result
 
 @router.get("/me", response_model=StudentResponse)
-def student_profile(
+async def student_profile(
     user=Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     if user.role != "student":
         raise HTTPException(status_code=403)
 
-    student = db.query(Student).filter(
-        Student.user_id == user.id
-    ).first()
+    student = await db.scalar(
+        select(Student).where(Student.user_id == user.id).limit(1)
+    )
 
     if not student:
         raise HTTPException(status_code=404)
@@ -258,6 +319,24 @@ def create_student_login(
         "email": new_user.email
     }
 
+@router.post("/logins/bulk")
+def create_student_logins_bulk(
+    data: BulkStudentLoginCreate,
+    db: Session = Depends(get_db),
+    user=Depends(admin_or_superadmin)
+):
+    # passwords are hashed in a process pool, users inserted in one batch
+    return provision_logins(
+        db,
+        Student,
+        "student",
+        user.institute_id,
+        [
+            {"id": l.student_id, "email": l.email, "password": l.password}
+            for l in data.logins
+        ]
+    )
+
 @router.get("/form-config", response_model=StudentFormConfigResponse)
 def get_student_form_config(
     db: Session = Depends(get_db),
@@ -278,26 +357,12 @@ def get_student_form_config(
 @router.get("/search")
 def search_students(
     q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     user=Depends(admin_or_superadmin)
 ):
-    students = db.query(Student).filter(
-        Student.institute_id == user.institute_id,
-        Student.name.ilike(f"%{q}%")
-    ).all()
-
-    return [
-        {
-            "id": s.id,
-            "name": s.name,
-            "admission_no": s.admission_no,
-            "roll_no": s.roll_no,
-            "class": s.class_name,
-            "class_id":s.class_id,
-            "section": s.section
-        }
-        for s in students
-    ]
+    # ranked: name / admission no / roll no / parent mobile
+    return search_index(db, user.institute_id, q, limit)
 
 @router.get("/form-fields")
 def get_student_form_fields(
@@ -384,6 +449,7 @@ def reset_student_login(
     new_password = "Std@" + str(student.id)
     user_obj.password = hash_password(new_password)
     db.commit()
+    invalidate_principal(user_obj.id)
 
     return {
         "message": "Password reset successfully",
@@ -452,7 +518,11 @@ def update_student(
                 value=str(v)
             ))
 
+    version = bump_search_version(db, user.institute_id)
     db.commit()
+    invalidate_dashboard(user.institute_id)
+    invalidate_principal(student.user_id)
+    index_student(student, version)
     return {"message": "Student updated successfully"}
 @router.delete("/{student_id}")
 def delete_student(
@@ -481,7 +551,10 @@ def delete_student(
 
     # 🔹 delete student
     db.delete(student)
+    version = bump_search_version(db, user.institute_id)
     db.commit()
+    invalidate_dashboard(user.institute_id)
+    unindex_student(user.institute_id, student_id, version)
 
     return {"message": "Student deleted successfully"}
 @router.put("/{student_id}/update-login")
@@ -512,6 +585,7 @@ def update_student_login(
 
     user_obj.email = data.email
     db.commit()
+    invalidate_principal(user_obj.id)
 
     return {"message": "Login email updated"}
 @router.put("/{student_id}/toggle-login")
@@ -532,6 +606,7 @@ def toggle_student_login(
 
     user_obj.is_active = not user_obj.is_active
     db.commit()
+    invalidate_principal(user_obj.id)
 
     return {
         "message": "Login status updated",
@@ -556,6 +631,7 @@ def change_student_password(
     user_obj = db.query(User).filter(User.id == student.user_id).first()
     user_obj.password = hash_password(data.password)
     db.commit()
+    invalidate_principal(user_obj.id)
 
     return {"message": "Password updated successfully"}
 
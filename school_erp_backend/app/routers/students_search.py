@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models.student import Student
 from app.dependencies import employee_permission_required
+from app.services.student_search import search_students as search_index
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
@@ -13,18 +13,15 @@ def search_students(
     db: Session = Depends(get_db),
     user=Depends(employee_permission_required("can_fees"))
 ):
-    students = db.query(Student).filter(
-        Student.institute_id == user.institute_id,
-        Student.full_name.ilike(f"%{q}%")
-    ).limit(10).all()
+    students = search_index(db, user.institute_id, q, limit=10)
 
     return [
         {
-            "id": s.id,
-            "name": s.name,
-            "registration_no": s.admission_no,
-            "class": s.class_name,
-            "section": s.section
+            "id": s["id"],
+            "name": s["name"],
+            "registration_no": s["admission_no"],
+            "class": s["class"],
+            "section": s["section"]
         }
         for s in students
     ]
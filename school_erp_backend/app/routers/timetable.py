@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.timetable import Timetable
 from app.models.weekday import Weekday
 from app.models.class_model import SchoolClass
@@ -14,7 +16,12 @@ from app.schemas.timetable_schema import (
 from app.dependencies import employee_permission_required
 from app.auth import get_current_user
 from fastapi.responses import StreamingResponse
-from app.services.timetable_pdf import generate_timetable_pdf
+from app.services.timetable_pdf import (
+    generate_timetable_pdf,
+    cached_timetable_pdf,
+    get_timetable_version,
+    bump_timetable_version
+)
 from app.models.period import Period
 from app.models.weekday import Weekday
 from app.models.subject import Subject
@@ -86,6 +93,7 @@ def add_or_update_period(
         db.add(record)
 
     db.commit()
+    bump_timetable_version(user.institute_id)
     db.refresh(record)
     return record
 
@@ -110,15 +118,15 @@ def add_or_update_period(
 #     ).all()
 
 @router.get("/")
-def get_timetable(
+async def get_timetable(
     class_id: int   |  None=None,
     section_id: int | None = None,
     teacher_id: int | None = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(employee_permission_required("can_timetable"))
 ):
     q = (
-        db.query(
+        select(
             Timetable,
             Subject.name.label("subject_name"),
             Employee.name.label("teacher_name"),
@@ -130,30 +138,32 @@ def get_timetable(
         .join(Employee, Employee.id == Timetable.teacher_id)
         .join(SchoolClass, SchoolClass.id == Timetable.class_id)
         .join(Section, Section.id == Timetable.section_id)
-        .filter(
+        .where(
             Timetable.institute_id == user.institute_id,
             # Timetable.class_id == class_id
         )
     )
 
     if section_id:
-        q = q.filter(Timetable.section_id == section_id)
+        q = q.where(Timetable.section_id == section_id)
     
     if class_id:
-        q = q.filter(Timetable.class_id == class_id)
+        q = q.where(Timetable.class_id == class_id)
 
     # if section_id:
     #     q = q.filter(Timetable.section_id == section_id)
 
     if teacher_id:
-        q = q.filter(Timetable.teacher_id == teacher_id)
+        q = q.where(Timetable.teacher_id == teacher_id)
 
 
-    results = []
-    for t, subject_name, teacher_name,class_name,section_name in q.order_by(
+    rows = await db.execute(q.order_by(
         Timetable.weekday_id,
         Timetable.period_no
-    ).all():
+    ))
+
+    results = []
+    for t, subject_name, teacher_name,class_name,section_name in rows.all():
         results.append({
             "id": t.id,
             "class_id": t.class_id,
@@ -175,6 +185,7 @@ def get_timetable(
 def add_weekday(name: str, db: Session = Depends(get_db), user=Depends(admin_or_superadmin)):
     db.add(Weekday(name=name, institute_id=user.institute_id))
     db.commit()
+    bump_timetable_version(user.institute_id)
     return {"message": "Weekday added"}
 
 @router.get("/teacher", response_model=list[TimetableResponse])
@@ -242,45 +253,61 @@ def export_class_timetable_pdf(
         Weekday.is_active == True
     ).all()
 
-    timetable = db.query(Timetable).filter(
-        Timetable.institute_id == user.institute_id,
-        Timetable.class_id == class_id,
-        (Timetable.section_id == section_id) |
-        (Timetable.section_id == None)
-    ).all()
+    # 🔹 one joined query → (weekday_id, period_no) slot map
+    rows = (
+        db.query(
+            Timetable.weekday_id,
+            Timetable.period_no,
+            Subject.name,
+            Employee.name
+        )
+        .outerjoin(Subject, Subject.id == Timetable.subject_id)
+        .outerjoin(Employee, Employee.id == Timetable.teacher_id)
+        .filter(
+            Timetable.institute_id == user.institute_id,
+            Timetable.class_id == class_id,
+            (Timetable.section_id == section_id) |
+            (Timetable.section_id == None)
+        )
+        .order_by(Timetable.id)
+        .all()
+    )
+
+    slots = {}
+    for weekday_id, period_no, subject_name, teacher_name in rows:
+        slots.setdefault(
+            (weekday_id, period_no),
+            f"{subject_name}\n({teacher_name})"
+        )
 
     # Build matrix
-    matrix = {}
-    for wd in weekdays:
-        row = []
-        for p in periods:
-            slot = next(
-                (
-                    t for t in timetable
-                    if t.weekday_id == wd.id and t.period_no == p.order_no
-                ),
-                None
-            )
-
-            if slot:
-                subject = db.query(Subject).get(slot.subject_id)
-                teacher = db.query(Employee).get(slot.teacher_id)
-                row.append(f"{subject.name}\n({teacher.name})")
-            else:
-                row.append("-")
-
-        matrix[wd.name] = row
-
-    pdf_buffer = generate_timetable_pdf(
-        school_name="School Timetable",
-        title=f"Class {class_id} Section {section_id or 'All'}",
-        periods=[
-            {
-                "name": p.name,
-                "time": f"{p.start_time}-{p.end_time}"
-            } for p in periods
-        ],
-        timetable_matrix=matrix
+    matrix = {
+        wd.name: [slots.get((wd.id, p.order_no), "-") for p in periods]
+        for wd in weekdays
+    }
+
+    period_headers = [
+        {
+            "name": p.name,
+            "time": f"{p.start_time}-{p.end_time}"
+        } for p in periods
+    ]
+
+    # digest guards against writes made through another worker process
+    pdf_buffer = cached_timetable_pdf(
+        (
+            user.institute_id,
+            class_id,
+            section_id,
+            get_timetable_version(user.institute_id),
+            hash(repr((period_headers, matrix)))
+        ),
+        lambda: generate_timetable_pdf(
+            school_name="School Timetable",
+            title=f"Class {class_id} Section {section_id or 'All'}",
+            periods=period_headers,
+            timetable_matrix=matrix
+        )
     )
 
     return StreamingResponse(
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.weekday import Weekday
 from app.dependencies import admin_or_superadmin
+from app.services.timetable_pdf import bump_timetable_version
 from app.schemas.weekday_schema import WeekdayCreate
 
 router = APIRouter(
@@ -22,6 +23,7 @@ def add_weekday(
     )
     db.add(weekday)
     db.commit()
+    bump_timetable_version(user.institute_id)
     db.refresh(weekday)
 
     return weekday
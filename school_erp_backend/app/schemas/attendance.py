@@ -13,3 +13,15 @@ class EmployeeAttendanceCreate(BaseModel):
     employee_id: int
     date: date
     status: str
+
+
+class StudentAttendanceRow(BaseModel):
+    student_id: int
+    status: str  # present | absent | leave
+
+
+class StudentAttendanceBulkCreate(BaseModel):
+    class_id: int
+    section_id: int | None = None
+    date: date
+    records: list[StudentAttendanceRow]
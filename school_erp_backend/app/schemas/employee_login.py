@@ -1,6 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class EmployeeLoginCreate(BaseModel):
     # employee_id: int
     email: str
     password: str
+
+class EmployeeLoginItem(EmployeeLoginCreate):
+    employee_id: int
+
+class BulkEmployeeLoginCreate(BaseModel):
+    logins: list[EmployeeLoginItem] = Field(..., min_length=1, max_length=5000)
@@ -23,3 +23,13 @@ class ExamMarkCreate(BaseModel):
     student_id: int
     subject_id: int
     marks: int
+
+
+class ExamMarksRow(BaseModel):
+    student_id: int
+    marks: list[Optional[int]]   # one per subject_ids entry, None = skip
+
+
+class ExamMarksMatrix(BaseModel):
+    subject_ids: list[int]
+    rows: list[ExamMarksRow]
@@ -1,6 +1,20 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class PromoteStudent(BaseModel):
     student_ids: list[int]
     to_class_id: int
     to_section: str | None = None
+
+
+class ClassPromotion(BaseModel):
+    from_class_id: int
+    from_section_id: int | None = None
+    to_class_id: int
+    to_section: str | None = None     # None → keep section name
+
+
+class PromoteClasses(BaseModel):
+    mappings: list[ClassPromotion]
+    batch_id: str | None = Field(None, max_length=64)   # resend to resume
+    dry_run: bool = False
+    chunk_size: int = Field(1000, ge=100, le=10000)
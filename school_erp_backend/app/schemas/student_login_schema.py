@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class StudentLoginCreate(BaseModel):
     # student_id: int
@@ -10,3 +10,9 @@ class StudentLoginUpdate(BaseModel):
 
 class StudentPasswordUpdate(BaseModel):
     password: str
+
+class StudentLoginItem(StudentLoginCreate):
+    student_id: int
+
+class BulkStudentLoginCreate(BaseModel):
+    logins: list[StudentLoginItem] = Field(..., min_length=1, max_length=5000)
@@ -5,10 +5,14 @@ import os
 
 # ------------------------------------------------------------------
 # Password hashing context (bcrypt)
+# NOTE: raising BCRYPT_ROUNDS rehashes old passwords on next login
 # ------------------------------------------------------------------
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 pwd_context = CryptContext(
     schemes=["bcrypt"],
-    deprecated="auto"
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS
 )
 
 # ------------------------------------------------------------------
@@ -33,6 +37,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     plain_password = plain_password.encode("utf-8")[:72]
     return pwd_context.verify(plain_password, hashed_password)
 
+
+def check_password(plain_password: str, hashed_password: str):
+    """
+    Returns (valid, new_hash). new_hash is set when the stored hash
+    uses an old scheme / cost and should be replaced.
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+
+    if pwd_context.needs_update(hashed_password):
+        return True, hash_password(plain_password)
+
+    return True, None
+
 # ------------------------------------------------------------------
 # JWT token creator
 # ------------------------------------------------------------------
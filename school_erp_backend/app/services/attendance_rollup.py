@@ -0,0 +1,221 @@
+import calendar
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import func, case
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+
+from app.models.student_attendance import StudentAttendance
+from app.models.employee_attendance import EmployeeAttendance
+from app.models.student_attendance_rollup import StudentAttendanceRollup
+from app.models.employee_attendance_rollup import EmployeeAttendanceRollup
+
+
+def month_range(month: str):
+    # "YYYY-MM" → (first day, last day)
+    try:
+        year, mon = (int(p) for p in month.split("-")[:2])
+        last = calendar.monthrange(year, mon)[1]
+        return date(year, mon, 1), date(year, mon, last)
+    except ValueError:
+        raise HTTPException(400, "month must be in YYYY-MM format")
+
+
+def _status_counts(model):
+    return (
+        func.coalesce(func.sum(case((model.status == "present", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((model.status == "absent", 1), else_=0)), 0),
+        func.coalesce(func.sum(case((model.status == "leave", 1), else_=0)), 0),
+        func.count(model.id),
+    )
+
+
+def _upsert(db: Session, model, key: dict, counts):
+    present, absent, leave, total = counts
+    stmt = insert(model).values(
+        **key,
+        present=present,
+        absent=absent,
+        leave=leave,
+        total=total
+    )
+    db.execute(stmt.on_duplicate_key_update(
+        present=stmt.inserted.present,
+        absent=stmt.inserted.absent,
+        leave=stmt.inserted.leave,
+        total=stmt.inserted.total
+    ))
+
+
+def _lock_key(db: Session, model, key: dict):
+    # zero row if missing, otherwise a no-op update → either way the
+    # rollup row is X-locked until commit
+    stmt = insert(model).values(**key, present=0, absent=0, leave=0, total=0)
+    db.execute(stmt.on_duplicate_key_update(total=model.total))
+
+
+# ------------------------------------------------------------------
+# Incremental maintenance (called from the attendance write paths)
+# Writers lock the rollup keys they touch BEFORE writing attendance
+# rows, then recount after the flush. Concurrent marks for the same
+# key are serialized, so the last commit can't write a stale total.
+# ------------------------------------------------------------------
+def _student_key(institute_id, class_id, section_id, day):
+    return {
+        "institute_id": institute_id,
+        "class_id": class_id,
+        "section_id": section_id,
+        "date": day
+    }
+
+
+def lock_student_rollup(db: Session, keys):
+    """
+    keys: iterable of (institute_id, class_id, section_id, date)
+    Sorted so two requests always lock in the same order (no deadlock).
+    """
+    for key in sorted(set(keys)):
+        _lock_key(db, StudentAttendanceRollup, _student_key(*key))
+
+
+def lock_employee_rollup(db: Session, institute_id: int, day: date):
+    _lock_key(db, EmployeeAttendanceRollup, {
+        "institute_id": institute_id,
+        "date": day
+    })
+
+
+def refresh_student_rollup(db: Session, keys):
+    """
+    keys: iterable of (institute_id, class_id, section_id, date),
+    already locked with lock_student_rollup in this transaction.
+    """
+    for institute_id, class_id, section_id, day in set(keys):
+        # locking read → latest committed rows, not the snapshot taken
+        # before we waited for the rollup lock
+        counts = db.query(*_status_counts(StudentAttendance)).filter(
+            StudentAttendance.institute_id == institute_id,
+            StudentAttendance.class_id == class_id,
+            StudentAttendance.section_id == section_id,
+            StudentAttendance.date == day
+        ).with_for_update(read=True).one()
+
+        _upsert(
+            db,
+            StudentAttendanceRollup,
+            _student_key(institute_id, class_id, section_id, day),
+            counts
+        )
+
+
+def refresh_employee_rollup(db: Session, institute_id: int, day: date):
+    # caller holds lock_employee_rollup for this key
+    counts = db.query(*_status_counts(EmployeeAttendance)).filter(
+        EmployeeAttendance.institute_id == institute_id,
+        EmployeeAttendance.date == day
+    ).with_for_update(read=True).one()
+
+    _upsert(db, EmployeeAttendanceRollup, {
+        "institute_id": institute_id,
+        "date": day
+    }, counts)
+
+
+# ------------------------------------------------------------------
+# Full backfill
+# ------------------------------------------------------------------
+def rebuild_rollups(db: Session, institute_id=None, start=None, end=None):
+    for raw, rollup, keys in (
+        (
+            StudentAttendance,
+            StudentAttendanceRollup,
+            ("institute_id", "class_id", "section_id", "date"),
+        ),
+        (
+            EmployeeAttendance,
+            EmployeeAttendanceRollup,
+            ("institute_id", "date"),
+        ),
+    ):
+        filters = []
+        raw_filters = []
+        if institute_id:
+            filters.append(rollup.institute_id == institute_id)
+            raw_filters.append(raw.institute_id == institute_id)
+        if start:
+            filters.append(rollup.date >= start)
+            raw_filters.append(raw.date >= start)
+        if end:
+            filters.append(rollup.date <= end)
+            raw_filters.append(raw.date <= end)
+
+        db.query(rollup).filter(*filters).delete(synchronize_session=False)
+
+        key_cols = [getattr(raw, k) for k in keys]
+        select = (
+            db.query(*key_cols, *_status_counts(raw))
+            .filter(*raw_filters)
+            .group_by(*key_cols)
+        )
+
+        db.execute(
+            insert(rollup).from_select(
+                [*keys, "present", "absent", "leave", "total"],
+                select.statement
+            )
+        )
+
+    db.commit()
+
+
+# ------------------------------------------------------------------
+# Readers
+# ------------------------------------------------------------------
+def student_totals(db: Session, institute_id, start, end, class_id=None, section_id=None):
+    q = db.query(
+        func.coalesce(func.sum(StudentAttendanceRollup.present), 0),
+        func.coalesce(func.sum(StudentAttendanceRollup.absent), 0),
+        func.coalesce(func.sum(StudentAttendanceRollup.leave), 0),
+        func.coalesce(func.sum(StudentAttendanceRollup.total), 0),
+    ).filter(
+        StudentAttendanceRollup.institute_id == institute_id,
+        StudentAttendanceRollup.date.between(start, end)
+    )
+
+    if class_id:
+        q = q.filter(StudentAttendanceRollup.class_id == class_id)
+
+    if section_id:
+        q = q.filter(StudentAttendanceRollup.section_id == section_id)
+
+    present, absent, leave, total = q.one()
+    return {
+        "present": int(present),
+        "absent": int(absent),
+        "leave": int(leave),
+        "total": int(total)
+    }
+
+
+def employee_totals(db: Session, institute_id, start, end):
+    q = db.query(
+        func.coalesce(func.sum(EmployeeAttendanceRollup.present), 0),
+        func.coalesce(func.sum(EmployeeAttendanceRollup.absent), 0),
+        func.coalesce(func.sum(EmployeeAttendanceRollup.leave), 0),
+        func.coalesce(func.sum(EmployeeAttendanceRollup.total), 0),
+    ).filter(
+        EmployeeAttendanceRollup.date.between(start, end)
+    )
+
+    # None → all institutes (superadmin)
+    if institute_id:
+        q = q.filter(EmployeeAttendanceRollup.institute_id == institute_id)
+
+    present, absent, leave, total = q.one()
+    return {
+        "present": int(present),
+        "absent": int(absent),
+        "leave": int(leave),
+        "total": int(total)
+    }
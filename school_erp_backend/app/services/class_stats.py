@@ -0,0 +1,149 @@
+from collections import defaultdict
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.models.class_model import SchoolClass
+from app.models.section import Section
+from app.models.student import Student
+from app.models.employee import Employee
+
+
+def build_fees_stats(total, paid):
+    total = total or 0
+    paid = paid or 0
+    pending = max(total - paid, 0)
+
+    def pct(x):
+        return round((x / total) * 100, 1) if total else 0
+
+    return {
+        "total": total,
+        "paid": paid,
+        "pending": pending,
+        "paid_percent": pct(paid),
+        "pending_percent": pct(pending)
+    }
+
+
+def fees_totals_by_class(db: Session, institute_id: int):
+    rows = db.execute(
+        text("""
+            SELECT
+                sf.class_id AS class_id,
+                COALESCE(SUM(sf.total_amount), 0) AS total,
+                COALESCE(SUM(sf.paid_amount), 0) AS paid
+            FROM student_fees sf
+            JOIN students s ON s.id = sf.student_id
+            WHERE sf.institute_id = :institute_id
+            GROUP BY sf.class_id
+        """),
+        {"institute_id": institute_id}
+    ).fetchall()
+
+    return {r.class_id: (r.total, r.paid) for r in rows}
+
+
+def load_class_stats(db: Session, institute_id: int):
+    """
+    Builds the GET /classes/ payload for every class of an institute
+    with a fixed number of grouped queries (classes, students, sections,
+    fees), whatever the number of classes.
+    """
+
+    # 🔹 1. Classes + coordinator name
+    classes = (
+        db.query(
+            SchoolClass.id,
+            SchoolClass.name,
+            Employee.name.label("coordinator_name")
+        )
+        .outerjoin(Employee, Employee.id == SchoolClass.class_coordinator_id)
+        .filter(SchoolClass.institute_id == institute_id)
+        .all()
+    )
+
+    if not classes:
+        return []
+
+    class_ids = [c.id for c in classes]
+
+    # 🔹 2. Student counts grouped by every dimension we report on
+    student_rows = (
+        db.query(
+            Student.class_id,
+            Student.section,
+            Student.gender,
+            Student.caste,
+            func.count(Student.id)
+        )
+        .filter(Student.class_id.in_(class_ids))
+        .group_by(
+            Student.class_id,
+            Student.section,
+            Student.gender,
+            Student.caste
+        )
+        .all()
+    )
+
+    totals = defaultdict(int)
+    boys = defaultdict(int)
+    girls = defaultdict(int)
+    castes = defaultdict(lambda: defaultdict(int))
+    per_section = defaultdict(int)
+
+    for class_id, section, gender, caste, count in student_rows:
+        totals[class_id] += count
+        if gender == "male":
+            boys[class_id] += count
+        elif gender == "female":
+            girls[class_id] += count
+        castes[class_id][caste] += count
+        per_section[(class_id, section)] += count
+
+    # 🔹 3. Sections of all classes
+    sections_by_class = defaultdict(list)
+    for sec in (
+        db.query(Section.id, Section.name, Section.class_id)
+        .filter(Section.class_id.in_(class_ids))
+        .all()
+    ):
+        sections_by_class[sec.class_id].append(sec)
+
+    # 🔹 4. Fee totals of all classes
+    fees = fees_totals_by_class(db, institute_id)
+
+    response = []
+    for cls in classes:
+        total_students = totals[cls.id]
+
+        def pct(x):
+            return round((x / total_students) * 100) if total_students else 0
+
+        section_list = [
+            {
+                "id": sec.id,
+                "name": sec.name,
+                "total": per_section[(cls.id, sec.name)]
+            }
+            for sec in sections_by_class[cls.id]
+        ]
+
+        response.append({
+            "id": cls.id,
+            "name": cls.name,
+            "class_coordinator_name": cls.coordinator_name,
+            "students_count": total_students,
+            "boys_percent": pct(boys[cls.id]),
+            "girls_percent": pct(girls[cls.id]),
+            "caste_stats": {
+                caste: pct(count)
+                for caste, count in castes[cls.id].items()
+            } if total_students else {},
+            "fees_stats": build_fees_stats(*fees.get(cls.id, (0, 0))),
+            "sections": section_list,
+            "sections_count": len(section_list)
+        })
+
+    return response
@@ -0,0 +1,152 @@
+import os
+import time
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.models.student import Student
+from app.models.employee import Employee
+from app.models.student_fee import StudentFee
+from app.models.fee_payment import FeePayment
+from app.models.exam import Exam
+from app.models.homework import Homework
+from app.models.institute import Institute
+from app.models.student_attendance_rollup import StudentAttendanceRollup
+from app.models.employee_attendance_rollup import EmployeeAttendanceRollup
+
+# ------------------------------------------------------------------
+# Per-institute dashboard counters
+# NOTE: without a backend the LRU is per process; plug a shared backend
+# (e.g. Redis) with set_snapshot_backend() so invalidations reach every
+# worker — the local LRU is bypassed then
+# ------------------------------------------------------------------
+DASHBOARD_CACHE_TTL_SECONDS = int(
+    os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60")
+)
+DASHBOARD_CACHE_SIZE = 1024
+
+_cache = OrderedDict()
+_lock = Lock()
+_backend = None
+
+
+def set_snapshot_backend(backend):
+    """
+    backend must provide get(key) -> dict | None,
+    set(key, value, ttl_seconds) and delete(key).
+    """
+    global _backend
+    _backend = backend
+
+
+def _key(institute_id):
+    return f"dashboard:{institute_id}"
+
+
+def compute_snapshot(db: Session, institute_id: int, today: date = None):
+    today = today or date.today()
+    month_start = today.replace(day=1)
+
+    def count(model, *filters):
+        return (
+            select(func.count(model.id))
+            .where(*filters)
+            .scalar_subquery()
+        )
+
+    def present(rollup):
+        return (
+            select(func.coalesce(func.sum(rollup.present), 0))
+            .where(rollup.institute_id == institute_id, rollup.date == today)
+            .scalar_subquery()
+        )
+
+    # every counter is a scalar subquery → one round trip
+    row = db.execute(select(
+        count(Student, Student.institute_id == institute_id).label("students"),
+        count(
+            Student,
+            Student.institute_id == institute_id,
+            Student.admission_date >= month_start
+        ).label("students_this_month"),
+        count(Employee, Employee.institute_id == institute_id).label("employees"),
+        present(StudentAttendanceRollup).label("student_attendance_today"),
+        present(EmployeeAttendanceRollup).label("employee_attendance_today"),
+        count(
+            StudentFee,
+            StudentFee.institute_id == institute_id,
+            StudentFee.is_paid == False
+        ).label("fee_defaulters"),
+        count(Exam, Exam.institute_id == institute_id).label("exams"),
+        count(
+            Homework,
+            Homework.institute_id == institute_id,
+            Homework.due_date >= today
+        ).label("active_homework"),
+        select(func.coalesce(func.sum(FeePayment.amount), 0))
+        .where(
+            FeePayment.institute_id == institute_id,
+            FeePayment.payment_date >= month_start
+        )
+        .scalar_subquery()
+        .label("month_collected"),
+        select(Institute.name)
+        .where(Institute.id == institute_id)
+        .scalar_subquery()
+        .label("institute_name"),
+    )).one()
+
+    snapshot = {k: int(v) for k, v in row._mapping.items() if k != "institute_name"}
+    snapshot["institute_name"] = row.institute_name or ""
+    snapshot["date"] = today.isoformat()
+    return snapshot
+
+
+def get_snapshot(db: Session, institute_id: int):
+    key = _key(institute_id)
+    today = date.today().isoformat()
+
+    # shared backend → it is the only tier, so an invalidation from
+    # any worker is seen by every worker on the next read
+    if _backend is not None:
+        snapshot = _backend.get(key)
+        if not snapshot or snapshot.get("date") != today:
+            snapshot = compute_snapshot(db, institute_id)
+            _backend.set(key, snapshot, DASHBOARD_CACHE_TTL_SECONDS)
+        return snapshot
+
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(key)
+        if cached:
+            _cache.move_to_end(key)
+
+    # date check → counters roll over at midnight even inside the TTL
+    if cached and cached[0] > now and cached[1]["date"] == today:
+        return cached[1]
+
+    snapshot = compute_snapshot(db, institute_id)
+
+    with _lock:
+        _cache[key] = (now + DASHBOARD_CACHE_TTL_SECONDS, snapshot)
+        _cache.move_to_end(key)
+        while len(_cache) > DASHBOARD_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return snapshot
+
+
+def invalidate_dashboard(institute_id: int | None):
+    # called after writes to students / attendance / fees / exams / homework
+    if not institute_id:
+        return
+
+    key = _key(institute_id)
+    with _lock:
+        _cache.pop(key, None)
+
+    if _backend is not None:
+        _backend.delete(key)
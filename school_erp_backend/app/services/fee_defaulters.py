@@ -0,0 +1,123 @@
+from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session
+
+from app.models.student import Student
+from app.models.student_fee import StudentFee
+
+
+def due_amount_expr():
+    return (
+        StudentFee.total_amount
+        + func.coalesce(StudentFee.fine_amount, 0)
+        - func.coalesce(StudentFee.paid_amount, 0)
+    )
+
+
+def _base_query(db: Session, columns, institute_id, class_id=None, section_id=None):
+    q = (
+        db.query(*columns)
+        .join(Student, Student.id == StudentFee.student_id)
+        .filter(
+            StudentFee.institute_id == institute_id,
+            StudentFee.is_paid == False
+        )
+    )
+
+    if class_id:
+        q = q.filter(Student.class_id == class_id)
+
+    if section_id:
+        q = q.filter(Student.section_id == section_id)
+
+    return q
+
+
+def list_defaulters(
+    db: Session,
+    institute_id: int,
+    class_id=None,
+    section_id=None,
+    sort: str = "due_desc",
+    after_due=None,
+    after_id=None,
+    limit=None
+):
+    """
+    Unpaid fees with due = total + fine - paid, computed in SQL.
+    Keyset cursor is (due_amount, student_fee_id) of the last row seen.
+    """
+    due = due_amount_expr().label("due_amount")
+
+    q = _base_query(
+        db,
+        [
+            StudentFee.id,
+            StudentFee.student_id,
+            Student.name,
+            Student.class_name,
+            Student.section,
+            due
+        ],
+        institute_id,
+        class_id,
+        section_id
+    )
+
+    descending = sort == "due_desc"
+
+    if after_due is not None and after_id is not None:
+        past = due_amount_expr() < after_due if descending else due_amount_expr() > after_due
+        q = q.filter(or_(
+            past,
+            and_(due_amount_expr() == after_due, StudentFee.id > after_id)
+        ))
+
+    q = q.order_by(
+        due.desc() if descending else due.asc(),
+        StudentFee.id
+    )
+
+    if limit:
+        q = q.limit(limit)
+
+    return [
+        {
+            "student_fee_id": r.id,
+            "student_id": r.student_id,
+            "name": r.name,
+            "class": r.class_name,
+            "section": r.section,
+            "due_amount": r.due_amount
+        }
+        for r in q.all()
+    ]
+
+
+def defaulters_summary(db: Session, institute_id: int, class_id=None, section_id=None):
+    rows = (
+        _base_query(
+            db,
+            [
+                Student.class_id,
+                Student.class_name,
+                func.count(StudentFee.id).label("count"),
+                func.coalesce(func.sum(due_amount_expr()), 0).label("total_due")
+            ],
+            institute_id,
+            class_id,
+            section_id
+        )
+        .group_by(Student.class_id, Student.class_name)
+        .order_by(Student.class_name)
+        .all()
+    )
+
+    return [
+        {
+            "class_id": r.class_id,
+            "class": r.class_name,
+            "defaulters": r.count,
+            "total_due": r.total_due
+        }
+        for r in rows
+    ]
@@ -0,0 +1,103 @@
+from sqlalchemy import select, insert, update, case
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.services.password_pool import hash_passwords
+
+
+# ------------------------------------------------------------------
+# Bulk logins for students / employees
+# ------------------------------------------------------------------
+def _norm_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def provision_logins(db: Session, model, role: str, institute_id: int, logins: list):
+    """
+    logins: [{"id", "email", "password"}] where id is a student / employee id.
+    Valid rows get a User and are linked back with one UPDATE;
+    the rest are returned as per-row errors.
+    """
+    # case-only duplicates ("A@x" / "a@x") → per-row errors, not an
+    # IntegrityError from the unique email key
+    logins = [{**item, "email": _norm_email(item["email"])} for item in logins]
+    errors = []
+
+    def fail(item, message):
+        errors.append({"id": item["id"], "email": item["email"], "error": message})
+
+    owners = {
+        row.id: row for row in db.execute(
+            select(model.id, model.name, model.user_id).where(
+                model.institute_id == institute_id,
+                model.id.in_({item["id"] for item in logins})
+            )
+        )
+    }
+
+    # 🔹 one query for every email already registered
+    taken = {
+        _norm_email(email) for email in db.scalars(
+            select(User.email).where(User.email.in_({item["email"] for item in logins}))
+        )
+    }
+
+    valid = []
+    seen_ids, seen_emails = set(), set()
+
+    for item in logins:
+        owner = owners.get(item["id"])
+        if not owner:
+            fail(item, "Not found")
+        elif owner.user_id or item["id"] in seen_ids:
+            fail(item, "Login already created")
+        elif item["email"] in taken or item["email"] in seen_emails:
+            fail(item, "Email already exists")
+        else:
+            seen_ids.add(item["id"])
+            seen_emails.add(item["email"])
+            valid.append(item)
+
+    if not valid:
+        return {"created": 0, "logins": [], "errors": errors}
+
+    hashes = hash_passwords([item["password"] for item in valid])
+
+    # executemany INSERT, then read the new ids back by email
+    db.execute(insert(User), [
+        {
+            "name": owners[item["id"]].name,
+            "email": item["email"],
+            "password": hashed,
+            "role": role,
+            "institute_id": institute_id
+        }
+        for item, hashed in zip(valid, hashes)
+    ])
+
+    user_ids = {
+        _norm_email(email): user_id for email, user_id in db.execute(
+            select(User.email, User.id).where(User.email.in_(seen_emails))
+        )
+    }
+
+    # single UPDATE … SET user_id = CASE id WHEN … END
+    db.execute(
+        update(model)
+        .where(model.id.in_(seen_ids))
+        .values(user_id=case(
+            {item["id"]: user_ids[item["email"]] for item in valid},
+            value=model.id
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+    db.commit()
+
+    return {
+        "created": len(valid),
+        "logins": [
+            {"id": item["id"], "email": item["email"]} for item in valid
+        ],
+        "errors": errors
+    }
@@ -0,0 +1,75 @@
+from sqlalchemy import or_, and_, select, exists
+from sqlalchemy.dialects.mysql import insert
+
+from app.models.message import Message
+from app.models.message_receipt import MessageReceipt
+
+
+# ------------------------------------------------------------------
+# Audience: which messages a user can see.
+# Broadcasts stay a single row; class:{id} / all_students are matched
+# against the principal instead of being fanned out per student.
+# ------------------------------------------------------------------
+def audience_filter(user):
+    clauses = [Message.receiver_role == user.role]
+
+    # 👇 only filter institute if user has one
+    if user.institute_id:
+        clauses.append(Message.institute_id == user.institute_id)
+
+    if user.role == "student":
+        clauses.append(or_(
+            Message.receiver_id == user.id,
+            and_(
+                Message.receiver_id == None,
+                or_(
+                    Message.category == None,
+                    Message.category == "all_students",
+                    Message.category == f"class:{user.class_id}"
+                )
+            )
+        ))
+        return and_(*clauses)
+
+    clauses.append(or_(
+        Message.receiver_id == None,
+        Message.receiver_id == user.id
+    ))
+
+    # category-based delivery (teachers)
+    if user.role == "employee":
+        clauses.append(or_(
+            Message.category == None,
+            Message.category == user.designation
+        ))
+
+    return and_(*clauses)
+
+
+def unread_filter(user):
+    # no receipt row for this user → unread (unique key lookup per message)
+    return and_(
+        audience_filter(user),
+        ~exists().where(
+            MessageReceipt.message_id == Message.id,
+            MessageReceipt.user_id == user.id
+        )
+    )
+
+
+def read_message_ids(message_ids, user_id):
+    return select(MessageReceipt.message_id).where(
+        MessageReceipt.user_id == user_id,
+        MessageReceipt.message_id.in_(message_ids)
+    )
+
+
+def record_receipt(db, message_id: int, user_id: int):
+    stmt = insert(MessageReceipt).values(
+        message_id=message_id,
+        user_id=user_id
+    )
+    # already read → keep the first read_at
+    db.execute(stmt.on_duplicate_key_update(
+        message_id=stmt.inserted.message_id
+    ))
@@ -0,0 +1,99 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+from fastapi import HTTPException
+
+from app.config import PASSWORD_HASH_WORKERS, LOGIN_MAX_PENDING
+from app.security import check_password, hash_password
+
+# ------------------------------------------------------------------
+# bcrypt off the request workers
+# One process pool, sized to the cores, shared by login checks and
+# bulk login provisioning. Once LOGIN_MAX_PENDING checks are queued,
+# new logins are turned away instead of piling up and starving every
+# other endpoint.
+# ------------------------------------------------------------------
+# below this many passwords the pool round trip is not worth it
+INLINE_HASH_LIMIT = 4
+HASH_CHUNK_SIZE = 16
+
+_executor = None
+_lock = Lock()
+_pending = 0
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+    return _executor
+
+
+# ------------------------------------------------------------------
+# Login checks
+# ------------------------------------------------------------------
+def pending_checks() -> int:
+    return _pending
+
+
+async def check_password_async(plain_password: str, hashed_password: str):
+    """(valid, new_hash) from security.check_password, run in the pool."""
+    global _pending
+
+    # counter only touched on the event loop thread → no lock needed
+    if _pending >= LOGIN_MAX_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many logins in progress, try again",
+            headers={"Retry-After": "1"}
+        )
+
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(), check_password, plain_password, hashed_password
+        )
+    finally:
+        _pending -= 1
+
+
+# ------------------------------------------------------------------
+# Bulk hashing (runs inside the process pool → must stay top-level)
+# ------------------------------------------------------------------
+def _hash_chunk(passwords: list) -> list:
+    return [hash_password(p) for p in passwords]
+
+
+def hash_passwords(passwords: list) -> list:
+    """bcrypt hashes in input order."""
+    if len(passwords) <= INLINE_HASH_LIMIT or PASSWORD_HASH_WORKERS == 1:
+        return _hash_chunk(passwords)
+
+    executor = _get_executor()
+
+    # small chunks, at most workers - 1 queued → a login check never
+    # waits behind a whole provisioning batch
+    in_flight = max(1, PASSWORD_HASH_WORKERS - 1)
+    queued = deque()
+    hashes = []
+
+    for i in range(0, len(passwords), HASH_CHUNK_SIZE):
+        if len(queued) >= in_flight:
+            hashes.extend(queued.popleft().result())
+        queued.append(executor.submit(_hash_chunk, passwords[i:i + HASH_CHUNK_SIZE]))
+
+    while queued:
+        hashes.extend(queued.popleft().result())
+    return hashes
+
+
+def shutdown_password_pool():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,209 @@
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import select, update, insert, func, literal, and_, or_, exists
+from sqlalchemy.orm import Session
+
+from app.models.student import Student
+from app.models.section import Section
+from app.models.class_model import SchoolClass
+from app.models.promotion_log import PromotionLog
+from app.services.student_search import bump_search_version
+
+PROMOTION_CHUNK_SIZE = 1000
+
+
+def _log_students(db: Session, ids, to_class_name, to_section_expr, batch_id=None):
+    # INSERT … SELECT: one statement per chunk instead of one per student
+    db.execute(
+        insert(PromotionLog).from_select(
+            [
+                "student_id", "from_class", "to_class", "from_section",
+                "to_section", "promoted_on", "institute_id", "batch_id"
+            ],
+            select(
+                Student.id,
+                Student.class_name,
+                literal(to_class_name),
+                Student.section,
+                to_section_expr,
+                literal(date.today()),
+                Student.institute_id,
+                literal(batch_id)
+            ).where(Student.id.in_(ids))
+        )
+    )
+
+
+def _target_section_id(to_class_id, section_name):
+    # section by name inside the target class (correlated when a column)
+    return (
+        select(Section.id)
+        .where(Section.class_id == to_class_id, Section.name == section_name)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def promote_ids(db: Session, ids, target: SchoolClass, to_section=None, keep_section=False, batch_id=None):
+    """
+    Moves the given students to target in one UPDATE (+ one log INSERT).
+    keep_section=True with no to_section keeps each student's section name
+    (9-A → 10-A); otherwise the section becomes to_section.
+    """
+    if not ids:
+        return 0
+
+    if keep_section and to_section is None:
+        section = Student.section
+    else:
+        section = literal(to_section)
+
+    _log_students(db, ids, target.name, section, batch_id)
+
+    db.execute(
+        update(Student)
+        .where(Student.id.in_(ids))
+        .values(
+            class_id=target.id,
+            class_name=target.name,
+            section=section,
+            section_id=_target_section_id(target.id, section)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    return len(ids)
+
+
+def _source_filter(institute_id, mapping, batch_id):
+    clauses = [
+        Student.institute_id == institute_id,
+        Student.class_id == mapping["from_class_id"],
+        # already moved in this batch (e.g. 9→10 before a resumed 10→11)
+        ~exists().where(
+            PromotionLog.batch_id == batch_id,
+            PromotionLog.student_id == Student.id
+        ),
+    ]
+
+    if mapping.get("from_section_id"):
+        clauses.append(Student.section_id == mapping["from_section_id"])
+
+    return and_(*clauses)
+
+
+def order_mappings(mappings):
+    # a class runs before the class that feeds into it (10→11 before 9→10)
+    # so nobody is promoted twice in one rollover
+    pending = list(mappings)
+    ordered = []
+
+    while pending:
+        sources = {m["from_class_id"] for m in pending}
+        ready = [
+            m for m in pending
+            if m["to_class_id"] not in sources or m["to_class_id"] == m["from_class_id"]
+        ]
+        if not ready:
+            raise HTTPException(400, "Class mappings form a cycle")
+
+        ordered.extend(ready)
+        pending = [m for m in pending if m not in ready]
+
+    return ordered
+
+
+def _load_targets(db: Session, institute_id, mappings):
+    class_ids = {m["to_class_id"] for m in mappings} | {m["from_class_id"] for m in mappings}
+
+    classes = {
+        c.id: c for c in db.query(SchoolClass).filter(
+            SchoolClass.id.in_(class_ids),
+            SchoolClass.institute_id == institute_id
+        )
+    }
+
+    missing = class_ids - classes.keys()
+    if missing:
+        raise HTTPException(404, f"Classes not found: {sorted(missing)}")
+
+    return classes
+
+
+def promote_classes(
+    db: Session,
+    institute_id: int,
+    mappings: list,
+    batch_id: str,
+    dry_run: bool = False,
+    chunk_size: int = PROMOTION_CHUNK_SIZE
+):
+    """
+    mappings: [{from_class_id, from_section_id?, to_class_id, to_section?}]
+
+    Each chunk is committed on its own. Re-running with the same batch_id
+    after a failure skips students already logged under it, so the
+    rollover resumes instead of promoting anyone twice.
+    """
+    mappings = order_mappings(mappings)
+    classes = _load_targets(db, institute_id, mappings)
+
+    results = []
+
+    for mapping in mappings:
+        target = classes[mapping["to_class_id"]]
+        source = _source_filter(institute_id, mapping, batch_id)
+        to_section = mapping.get("to_section")
+
+        # same class + section change: skip students already there
+        if target.id == mapping["from_class_id"]:
+            if to_section is None:
+                raise HTTPException(400, "Mapping does not change class or section")
+            source = and_(source, or_(Student.section != to_section, Student.section == None))
+
+        if dry_run:
+            rows = (
+                db.query(Student.section, func.count(Student.id))
+                .filter(source)
+                .group_by(Student.section)
+                .all()
+            )
+            results.append({
+                "from_class_id": mapping["from_class_id"],
+                "to_class_id": target.id,
+                "students": sum(n for _, n in rows),
+                "by_section": {section or "": n for section, n in rows}
+            })
+            continue
+
+        promoted = 0
+        after_id = 0
+
+        while True:
+            ids = db.scalars(
+                select(Student.id)
+                .where(source, Student.id > after_id)
+                .order_by(Student.id)
+                .limit(chunk_size)
+            ).all()
+
+            if not ids:
+                break
+
+            promoted += promote_ids(
+                db, ids, target, to_section,
+                keep_section=True,
+                batch_id=batch_id
+            )
+            after_id = ids[-1]
+            bump_search_version(db, institute_id)
+            db.commit()
+
+        results.append({
+            "from_class_id": mapping["from_class_id"],
+            "to_class_id": target.id,
+            "students": promoted
+        })
+
+    return results
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+from fastapi.responses import StreamingResponse
+
+from app.database import ReadSessionLocal
+
+EXPORT_ROWS_PER_FETCH = 1000
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def stream_export(build_query, fields, fmt: str, filename: str):
+    """
+    Streams a report as CSV / NDJSON using a server-side cursor.
+
+    build_query(db) must return the query to export; it runs on a session
+    owned by the generator because the request session is closed once
+    the handler returns.
+    """
+
+    def generate():
+        db = ReadSessionLocal()
+        try:
+            rows = build_query(db).yield_per(EXPORT_ROWS_PER_FETCH)
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+
+            if fmt == "csv":
+                writer.writerow(fields)
+
+            for row in rows:
+                if fmt == "csv":
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(dict(zip(fields, row)), default=str))
+                    buffer.write("\n")
+
+                if buffer.tell() >= EXPORT_FLUSH_BYTES:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+
+            if buffer.tell():
+                yield buffer.getvalue()
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition":
+            f"attachment; filename={filename}.{fmt}"
+        }
+    )
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+from fastapi import HTTPException
+
+from app.config import (
+    REPORT_CACHE_DIR,
+    REPORT_CACHE_TTL_SECONDS,
+    REPORT_RENDER_WORKERS,
+    REPORT_ROWS_PER_TABLE
+)
+
+JOB_ID_PATTERN = re.compile(r"^\d+-[0-9a-f]{40}$")
+
+_executor = None
+_jobs = {}
+_lock = Lock()
+
+
+# ------------------------------------------------------------------
+# Renderer (runs inside the process pool → must stay top-level)
+# ------------------------------------------------------------------
+def render_table_pdf(path: str, title: str, header: list, rows: list):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+
+    style = TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ])
+
+    elements = [Paragraph(title, getSampleStyleSheet()["Heading2"])]
+
+    # fixed-size chunks: reportlab splits many small tables in linear time
+    for i in range(0, max(len(rows), 1), REPORT_ROWS_PER_TABLE):
+        table = Table(
+            [header] + rows[i:i + REPORT_ROWS_PER_TABLE],
+            repeatRows=1
+        )
+        table.setStyle(style)
+        elements.append(table)
+
+    tmp_path = f"{path}.part"
+    SimpleDocTemplate(tmp_path, pagesize=A4).build(elements)
+    os.replace(tmp_path, path)
+
+    return path
+
+
+# ------------------------------------------------------------------
+# Cache directory
+# ------------------------------------------------------------------
+def job_path(job_id: str):
+    return os.path.join(REPORT_CACHE_DIR, f"{job_id}.pdf")
+
+
+def evict_expired():
+    if not os.path.isdir(REPORT_CACHE_DIR):
+        return
+
+    cutoff = time.time() - REPORT_CACHE_TTL_SECONDS
+    for name in os.listdir(REPORT_CACHE_DIR):
+        path = os.path.join(REPORT_CACHE_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    with _lock:
+        for job_id in [
+            j for j, job in _jobs.items()
+            if job["created"] < cutoff
+        ]:
+            _jobs.pop(job_id, None)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=REPORT_RENDER_WORKERS)
+    return _executor
+
+
+def shutdown_render_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _job_id(institute_id, cache_key, title, header, rows):
+    # the rows are part of the key → any change to the underlying data
+    # (e.g. attendance re-marked) yields a new job instead of a stale file
+    digest = hashlib.sha1(cache_key.encode())
+    digest.update(repr((title, header, rows)).encode())
+    return f"{institute_id}-{digest.hexdigest()}"
+
+
+# ------------------------------------------------------------------
+# Jobs
+# ------------------------------------------------------------------
+def submit_pdf_job(institute_id, cache_key, title, header, rows):
+    """
+    Queues a render and returns the job id. Identical requests
+    (same institute + cache_key + rows) share one job until the TTL
+    expires. rows must be plain, picklable values.
+    """
+    evict_expired()
+    os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+
+    job_id = _job_id(institute_id, cache_key, title, header, rows)
+
+    with _lock:
+        job = _jobs.get(job_id)
+        if job and job["status"] != "failed":
+            return job_id
+
+        if os.path.exists(job_path(job_id)):
+            _jobs[job_id] = {
+                "institute_id": institute_id,
+                "status": "done",
+                "error": None,
+                "future": None,
+                "created": time.time()
+            }
+            return job_id
+
+        job = {
+            "institute_id": institute_id,
+            "status": "running",
+            "error": None,
+            "future": None,
+            "created": time.time()
+        }
+        _jobs[job_id] = job
+
+        # submitted under the lock → an identical request never sees a
+        # running job without its future
+        try:
+            job["future"] = future = _get_executor().submit(
+                render_table_pdf, job_path(job_id), title, header, rows
+            )
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            raise
+
+    def _done(f):
+        if f.exception():
+            job["status"] = "failed"
+            job["error"] = str(f.exception())
+        else:
+            job["status"] = "done"
+
+    future.add_done_callback(_done)
+    return job_id
+
+
+def get_pdf_job(job_id: str, institute_id):
+    # job ids are prefixed with the owning institute
+    if not JOB_ID_PATTERN.match(job_id) or not job_id.startswith(f"{institute_id}-"):
+        return None
+
+    with _lock:
+        job = _jobs.get(job_id)
+
+    # another worker may have rendered it into the shared cache dir
+    if not job:
+        if os.path.exists(job_path(job_id)):
+            return {"status": "done", "error": None}
+        return None
+
+    return job
+
+
+def wait_pdf_job(job_id: str, timeout=None):
+    """Path of the rendered file, or None if there is no such report."""
+    with _lock:
+        job = _jobs.get(job_id)
+
+    if job and job["future"]:
+        job["future"].result(timeout=timeout)
+    elif job and job["status"] == "running":
+        # still being queued → pending, not missing
+        raise HTTPException(
+            status_code=409,
+            detail="Report is running",
+            headers={"Retry-After": "1"}
+        )
+
+    path = job_path(job_id)
+    return path if os.path.exists(path) else None
@@ -0,0 +1,255 @@
+import io
+import csv
+import codecs
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+
+from app.models.student import Student
+from app.models.section import Section
+from app.models.class_model import SchoolClass
+from app.models.student_extra_data import StudentExtraData
+from app.models.student_form_field import StudentFormField
+from app.schemas.student import StudentCreate
+from app.services.student_search import bump_search_version
+
+# ------------------------------------------------------------------
+# Bulk student import (CSV / XLSX)
+# Rows are validated and inserted in chunks; bad rows are reported
+# back with their sheet row number instead of failing the upload.
+# ------------------------------------------------------------------
+IMPORT_CHUNK_SIZE = 500
+
+STUDENT_FIELDS = set(StudentCreate.model_fields) - {"class_id", "extra_fields"}
+
+# common spreadsheet headers → model fields
+HEADER_ALIASES = {
+    "class": "class_name",
+    "student_name": "name",
+    "admission_number": "admission_no",
+    "roll_number": "roll_no",
+}
+
+
+def _header(value):
+    key = "_".join(str(value or "").strip().lower().split())
+    return HEADER_ALIASES.get(key, key)
+
+
+def _cell(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _check_utf8(file):
+    # whole file up front → a bad byte is a 400 before any chunk commits
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        for block in iter(lambda: file.read(64 * 1024), b""):
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(400, "CSV must be UTF-8")
+    file.seek(0)
+
+
+def _csv_rows(file):
+    _check_utf8(file)
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    yield from reader
+
+
+def _xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise HTTPException(400, "XLSX import is not available, upload a CSV")
+
+    # read_only → rows are streamed instead of loading the whole sheet
+    sheet = load_workbook(file, read_only=True, data_only=True).active
+    yield from sheet.iter_rows(values_only=True)
+
+
+def read_rows(filename: str, file):
+    """Yields (sheet_row_no, {header: value}) for every non-empty row."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        rows = _csv_rows(file)
+    elif name.endswith(".xlsx"):
+        rows = _xlsx_rows(file)
+    else:
+        raise HTTPException(400, "Upload a .csv or .xlsx file")
+
+    headers = [_header(h) for h in next(rows, [])]
+    if "name" not in headers or "admission_no" not in headers:
+        raise HTTPException(400, "File needs name and admission_no columns")
+
+    for row_no, values in enumerate(rows, start=2):
+        row = {
+            h: _cell(v) for h, v in zip(headers, values) if h
+        }
+        if any(row.values()):
+            yield row_no, row
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Lookups:
+    """Class / section / form-field maps loaded once per import."""
+
+    def __init__(self, db: Session, institute_id: int):
+        classes = db.execute(
+            select(SchoolClass.id, SchoolClass.name)
+            .where(SchoolClass.institute_id == institute_id)
+        ).all()
+        self.classes = {name.strip().lower(): (cid, name) for cid, name in classes}
+
+        sections = db.execute(
+            select(Section.id, Section.class_id, Section.name)
+            .where(Section.institute_id == institute_id)
+        ).all()
+        self.sections = {
+            (class_id, name.strip().lower()): (sid, name)
+            for sid, class_id, name in sections
+        }
+
+        self.extra_keys = set(db.scalars(
+            select(StudentFormField.field_key).where(
+                StudentFormField.institute_id == institute_id,
+                StudentFormField.is_active == True
+            )
+        ))
+
+
+def _build(row, lookups: _Lookups, institute_id: int):
+    """Returns (student values, extra fields, errors)."""
+    errors = []
+
+    cls = lookups.classes.get((row.get("class_name") or "").lower())
+    if not cls:
+        errors.append(f"Unknown class '{row.get('class_name') or ''}'")
+
+    section_id = None
+    if cls and row.get("section"):
+        section = lookups.sections.get((cls[0], row["section"].lower()))
+        if not section:
+            errors.append(f"Unknown section '{row['section']}' for class {cls[1]}")
+        else:
+            section_id, row["section"] = section
+
+    data = {k: v for k, v in row.items() if k in STUDENT_FIELDS}
+    # unknown class is already reported → still validate the other cells
+    data["class_id"], data["class_name"] = cls or (0, row.get("class_name") or "")
+
+    try:
+        student = StudentCreate(**data)
+    except ValidationError as e:
+        errors.extend(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+        )
+
+    if errors:
+        return None, None, errors
+
+    values = student.dict(exclude={"extra_fields"})
+    values["section_id"] = section_id
+    values["institute_id"] = institute_id
+
+    extra = {
+        k: v for k, v in row.items()
+        if k in lookups.extra_keys and v is not None
+    }
+    return values, extra, []
+
+
+def import_students(
+    db: Session,
+    institute_id: int,
+    filename: str,
+    file,
+    dry_run: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE
+):
+    lookups = _Lookups(db, institute_id)
+    seen = set()
+    report = {"total": 0, "imported": 0, "errors": []}
+
+    def fail(row_no, row, messages):
+        report["errors"].append({
+            "row": row_no,
+            "admission_no": row.get("admission_no"),
+            "errors": messages
+        })
+
+    for chunk in _chunks(read_rows(filename, file), chunk_size):
+        report["total"] += len(chunk)
+
+        # 🔹 one lookup per chunk for admission numbers already taken
+        numbers = {row.get("admission_no") for _, row in chunk} - {None}
+        taken = set(db.scalars(
+            select(Student.admission_no).where(
+                Student.institute_id == institute_id,
+                Student.admission_no.in_(numbers)
+            )
+        )) if numbers else set()
+
+        students, extras = [], {}
+        for row_no, row in chunk:
+            admission_no = row.get("admission_no")
+            if admission_no in taken:
+                fail(row_no, row, ["Admission number already exists"])
+                continue
+            if admission_no in seen:
+                fail(row_no, row, ["Admission number repeated in file"])
+                continue
+
+            values, extra, errors = _build(row, lookups, institute_id)
+            if errors:
+                fail(row_no, row, errors)
+                continue
+
+            seen.add(admission_no)
+            students.append(values)
+            if extra:
+                extras[admission_no] = extra
+
+        if dry_run or not students:
+            report["imported"] += len(students)
+            continue
+
+        # executemany: one INSERT for the whole chunk
+        db.execute(insert(Student), students)
+
+        if extras:
+            ids = dict(db.execute(
+                select(Student.admission_no, Student.id).where(
+                    Student.institute_id == institute_id,
+                    Student.admission_no.in_(extras)
+                )
+            ).all())
+            db.execute(insert(StudentExtraData), [
+                {"student_id": ids[no], "field_key": k, "value": v}
+                for no, fields in extras.items()
+                for k, v in fields.items()
+            ])
+
+        bump_search_version(db, institute_id)
+        db.commit()
+        report["imported"] += len(students)
+
+    report["failed"] = len(report["errors"])
+    report["dry_run"] = dry_run
+    return report
@@ -0,0 +1,382 @@
+import os
+import re
+import time
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+from threading import Lock
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.student import Student
+from app.models.institute import Institute
+
+# ------------------------------------------------------------------
+# Per-institute student search index (trigram + token prefix)
+# Covers name, admission_no, roll_no and parent mobiles.
+# NOTE: per-process; every student write bumps
+# institutes.student_search_version so the other workers reload.
+# Cost per write: one UPDATE on the institutes row (held until commit,
+# so student writes of one institute serialise on it) and a full index
+# reload in every other worker on its next search. Bulk import and
+# promotion bump once per chunk on purpose, not once per student.
+# ------------------------------------------------------------------
+STUDENT_SEARCH_TTL_SECONDS = int(
+    os.getenv("STUDENT_SEARCH_TTL_SECONDS", "600")
+)
+SEARCH_LIMIT = 20
+
+# shorter queries have no trigram → prefix matches only here;
+# list_students uses SQL LIKE for them instead
+INDEX_MIN_QUERY_LENGTH = 3
+
+# Dice similarity of padded trigrams for a name to count as a typo match
+FUZZY_MIN_SIMILARITY = 0.5
+
+_RESULT_COLUMNS = (
+    Student.id,
+    Student.name,
+    Student.admission_no,
+    Student.roll_no,
+    Student.class_name,
+    Student.class_id,
+    Student.section,
+    Student.father_mobile,
+    Student.mother_mobile,
+    Student.guardian_mobile,
+)
+
+_indexes = {}
+_lock = Lock()
+
+
+def _norm(value):
+    return " ".join(str(value).lower().split()) if value else ""
+
+
+def _digits(value):
+    return re.sub(r"\D", "", value) if value else ""
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _padded(text):
+    # " sharma " → " sh", "sha", …, "ma " so word edges count for typos
+    return _trigrams(f" {text} ")
+
+
+def _similarity(a, b):
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0
+
+
+def _name_keys(row):
+    name = _norm(row["name"])
+    return list(dict.fromkeys([name] + name.split()))
+
+
+def _keys(row):
+    """Searchable strings for one student (name keys first)."""
+    keys = _name_keys(row)
+
+    for field in ("admission_no", "roll_no"):
+        value = _norm(row[field])
+        if value:
+            keys.append(value)
+
+    for field in ("father_mobile", "mother_mobile", "guardian_mobile"):
+        value = _digits(row[field])
+        if value:
+            keys.append(value)
+
+    # dedupe, keep order
+    return list(dict.fromkeys(k for k in keys if k))
+
+
+def _score(keys, q):
+    best = 0
+    for i, key in enumerate(keys):
+        if key == q:
+            score = 100
+        elif key.startswith(q):
+            score = 90 if i == 0 else 80     # full name beats a later word
+        elif q in key:
+            score = 60
+        else:
+            continue
+        best = max(best, score)
+    return best
+
+
+class _InstituteIndex:
+
+    def __init__(self):
+        self.docs = {}                    # id → result row
+        self.keys = {}                    # id → searchable strings
+        self.names = {}                   # id → number of leading name keys
+        self.grams = defaultdict(set)     # trigram → ids
+        self.tokens = []                  # sorted (name key, id) for prefixes
+        self.exact = defaultdict(set)     # admission / roll / mobile → ids
+        self.lock = Lock()
+        self.loaded_at = time.monotonic()
+        self.version = None               # institutes.student_search_version
+
+    def load(self, rows):
+        # append then sort once instead of an insort per key
+        for row in rows:
+            self.add(row, sort=False)
+        self.tokens.sort()
+
+    def add(self, row, sort=True):
+        self.remove(row["id"])
+
+        keys = _keys(row)
+        self.docs[row["id"]] = {
+            "id": row["id"],
+            "name": row["name"],
+            "admission_no": row["admission_no"],
+            "roll_no": row["roll_no"],
+            "class": row["class_name"],
+            "class_id": row["class_id"],
+            "section": row["section"],
+        }
+        self.keys[row["id"]] = keys
+        self.names[row["id"]] = len(_name_keys(row))
+
+        for i, key in enumerate(keys):
+            if i >= self.names[row["id"]]:
+                self.exact[key].add(row["id"])
+            elif sort:
+                insort(self.tokens, (key, row["id"]))
+            else:
+                self.tokens.append((key, row["id"]))
+
+            for gram in _padded(key):
+                self.grams[gram].add(row["id"])
+
+    def remove(self, student_id):
+        keys = self.keys.pop(student_id, None)
+        if keys is None:
+            return
+
+        self.docs.pop(student_id, None)
+        names = self.names.pop(student_id)
+
+        for n, key in enumerate(keys):
+            if n >= names:
+                ids = self.exact.get(key)
+                if ids:
+                    ids.discard(student_id)
+                    if not ids:
+                        del self.exact[key]
+            else:
+                i = bisect_left(self.tokens, (key, student_id))
+                if i < len(self.tokens) and self.tokens[i] == (key, student_id):
+                    del self.tokens[i]
+
+            for gram in _padded(key):
+                ids = self.grams.get(gram)
+                if ids:
+                    ids.discard(student_id)
+                    if not ids:
+                        del self.grams[gram]
+
+    def _prefix_scores(self, q):
+        """
+        1–2 char queries: name prefixes + exact identifiers (roll no "7").
+        Scored straight from the sorted tokens (same ranks as _score).
+        """
+        scored = {sid: 100 for sid in self.exact.get(q, ())}
+        i = bisect_left(self.tokens, (q,))
+        while i < len(self.tokens) and self.tokens[i][0].startswith(q):
+            key, sid = self.tokens[i]
+            if key == q:
+                score = 100
+            else:
+                score = 90 if key == self.keys[sid][0] else 80
+            if score > scored.get(sid, 0):
+                scored[sid] = score
+            i += 1
+        return scored
+
+    def _substring_ids(self, q):
+        # every trigram of q must be in the key → intersect, smallest first
+        postings = sorted(
+            (self.grams.get(gram, set()) for gram in _trigrams(q)),
+            key=len
+        )
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids &= posting
+            if not ids:
+                break
+        return ids
+
+    def _fuzzy_ids(self, q):
+        grams = _padded(q)
+        hits = defaultdict(int)
+        for gram in grams:
+            for sid in self.grams.get(gram, ()):
+                hits[sid] += 1
+
+        scored = {}
+        for sid, n in hits.items():
+            if 2 * n / (len(grams) + 3) < FUZZY_MIN_SIMILARITY:
+                continue     # cannot reach the threshold on any key
+            best = max(
+                _similarity(grams, _padded(key))
+                for key in self.keys[sid][:self.names[sid]]
+            )
+            if best >= FUZZY_MIN_SIMILARITY:
+                scored[sid] = int(50 * best)
+        return scored
+
+    def search(self, q, limit=SEARCH_LIMIT):
+        """
+        Ranked ids: exact > prefix > substring > typo match on names.
+        limit=None returns substring matches only (list filtering).
+        """
+        if len(q) < INDEX_MIN_QUERY_LENGTH:
+            scored = self._prefix_scores(q)
+        else:
+            scored = {}
+            for sid in self._substring_ids(q):
+                score = _score(self.keys[sid], q)
+                if score:
+                    scored[sid] = score
+
+        # too few real matches → fill up with near misses ("shrma" → sharma)
+        if limit is not None and len(scored) < limit and len(q) >= INDEX_MIN_QUERY_LENGTH:
+            for sid, score in self._fuzzy_ids(q).items():
+                scored.setdefault(sid, score)
+
+        def rank(sid):
+            return (scored[sid], -len(self.docs[sid]["name"]), -sid)
+
+        if limit is None:
+            return sorted(scored, key=rank, reverse=True)
+        return heapq.nlargest(limit, scored, key=rank)
+
+
+def _current_version(db: Session, institute_id: int):
+    return db.scalar(
+        select(Institute.student_search_version).where(Institute.id == institute_id)
+    )
+
+
+def bump_search_version(db: Session, institute_id: int):
+    """
+    Marks the institute's students as changed (call before the commit).
+    Returns the new version for index_student / unindex_student.
+    """
+    db.execute(
+        update(Institute)
+        .where(Institute.id == institute_id)
+        .values(student_search_version=Institute.student_search_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return _current_version(db, institute_id)
+
+
+def _load(db: Session, institute_id: int, version):
+    index = _InstituteIndex()
+    index.version = version
+    index.load(db.execute(
+        select(*_RESULT_COLUMNS).where(Student.institute_id == institute_id)
+    ).mappings())
+    return index
+
+
+def _get_index(db: Session, institute_id: int):
+    # one PK lookup per search → writes from any worker are seen at once
+    version = _current_version(db, institute_id)
+
+    with _lock:
+        index = _indexes.get(institute_id)
+
+    if (
+        index
+        and index.version == version
+        and time.monotonic() - index.loaded_at < STUDENT_SEARCH_TTL_SECONDS
+    ):
+        return index
+
+    # built outside the registry lock → other institutes are not blocked
+    index = _load(db, institute_id, version)
+    with _lock:
+        _indexes[institute_id] = index
+    return index
+
+
+def _ranked(index, q, limit):
+    ids = index.search(q, limit)
+
+    # phone numbers are indexed as bare digits ("98765 43210" → "9876543210")
+    digits = _digits(q)
+    if len(digits) >= INDEX_MIN_QUERY_LENGTH and digits != q and (limit is None or len(ids) < limit):
+        extra = [i for i in index.search(digits, limit) if i not in ids]
+        ids = ids + (extra if limit is None else extra[:limit - len(ids)])
+
+    return ids
+
+
+def search_student_ids(db: Session, institute_id: int, q: str, limit=SEARCH_LIMIT):
+    """Ranked student ids; limit=None returns every match."""
+    q = _norm(q)
+    if not q:
+        return []
+
+    index = _get_index(db, institute_id)
+    with index.lock:
+        return _ranked(index, q, limit)
+
+
+def search_students(db: Session, institute_id: int, q: str, limit=SEARCH_LIMIT):
+    q = _norm(q)
+    if not q:
+        return []
+
+    index = _get_index(db, institute_id)
+    with index.lock:
+        return [index.docs[i] for i in _ranked(index, q, limit)]
+
+
+# ===== incremental updates (call after commit) =====
+# version is what bump_search_version returned for this write; the local
+# index only skips its reload when no other write came in between
+
+def _advance(index, version):
+    if version is not None and index.version == version - 1:
+        index.version = version
+
+
+def index_student(student, version=None):
+    with _lock:
+        index = _indexes.get(student.institute_id)
+
+    # not loaded yet → picked up by the lazy load
+    if not index:
+        return
+
+    row = {col.key: getattr(student, col.key) for col in _RESULT_COLUMNS}
+    with index.lock:
+        index.add(row)
+        _advance(index, version)
+
+
+def unindex_student(institute_id: int, student_id: int, version=None):
+    with _lock:
+        index = _indexes.get(institute_id)
+
+    if index:
+        with index.lock:
+            index.remove(student_id)
+            _advance(index, version)
+
+
+def drop_search_index(institute_id: int | None):
+    # bulk writes (promotion, import) → rebuild on next search
+    with _lock:
+        _indexes.pop(institute_id, None)
@@ -1,8 +1,13 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
 from io import BytesIO
+from collections import OrderedDict
+from threading import Lock
+
+TIMETABLE_PDF_CACHE_SIZE = 256
+
+# institute_id → version, bumped on every timetable / period / weekday write
+_versions = {}
+_pdf_cache = OrderedDict()
+_lock = Lock()
 
 
 def generate_timetable_pdf(
@@ -22,6 +27,11 @@ def generate_timetable_pdf(
       ...
     }
     """
+    # reportlab is heavy → imported on first render, not at boot
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
 
     buffer = BytesIO()
     pdf = SimpleDocTemplate(buffer, pagesize=A4)
@@ -58,3 +68,33 @@ def generate_timetable_pdf(
 
     buffer.seek(0)
     return buffer
+
+
+def bump_timetable_version(institute_id: int):
+    with _lock:
+        _versions[institute_id] = _versions.get(institute_id, 0) + 1
+
+
+def get_timetable_version(institute_id: int):
+    with _lock:
+        return _versions.get(institute_id, 0)
+
+
+def cached_timetable_pdf(key: tuple, render):
+    """
+    key = (institute_id, class_id, section_id, version, content digest)
+    render() is only called on a miss and must return a BytesIO.
+    """
+    with _lock:
+        data = _pdf_cache.get(key)
+        if data is not None:
+            _pdf_cache.move_to_end(key)
+
+    if data is None:
+        data = render().getvalue()
+        with _lock:
+            _pdf_cache[key] = data
+            while len(_pdf_cache) > TIMETABLE_PDF_CACHE_SIZE:
+                _pdf_cache.popitem(last=False)
+
+    return BytesIO(data)
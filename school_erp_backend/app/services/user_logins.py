@@ -0,0 +1,21 @@
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+
+def load_logins(db: Session, user_ids):
+    """
+    Resolves login rows for many students / employees in one IN query.
+    Returns {user_id: row} with id, email and is_active.
+    """
+    ids = {uid for uid in user_ids if uid}
+    if not ids:
+        return {}
+
+    rows = (
+        db.query(User.id, User.email, User.is_active)
+        .filter(User.id.in_(ids))
+        .all()
+    )
+
+    return {r.id: r for r in rows}
@@ -1,24 +1,82 @@
+import hashlib
 import os
-import uuid
+import tempfile
 from fastapi import UploadFile, HTTPException
-from app.config import MESSAGE_UPLOAD_DIR, ALLOWED_FILE_TYPES
+from app.config import MESSAGE_UPLOAD_DIR, ALLOWED_FILE_TYPES, MAX_FILE_SIZE_MB
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+
+
+def content_path(digest: str):
+    # content-addressed: uploads/messages/ab/abcdef… (one copy per content)
+    return os.path.join(MESSAGE_UPLOAD_DIR, digest[:2], digest)
+
+
+def resolve_stored_file(file_path: str):
+    """
+    Returns (absolute path, os.stat_result) for a stored attachment, or
+    None if it is missing or points outside MESSAGE_UPLOAD_DIR.
+    """
+    root = os.path.realpath(MESSAGE_UPLOAD_DIR)
+    path = os.path.realpath(file_path)
+
+    if os.path.commonpath([root, path]) != root:
+        return None
+
+    try:
+        return path, os.stat(path)
+    except FileNotFoundError:
+        return None
 
 
 def save_message_file(file: UploadFile):
     if file.content_type not in ALLOWED_FILE_TYPES:
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
+    # cheap early reject when the client sent a size
+    if file.size is not None and file.size > MAX_FILE_SIZE_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds {MAX_FILE_SIZE_MB} MB"
+        )
+
     os.makedirs(MESSAGE_UPLOAD_DIR, exist_ok=True)
 
-    ext = file.filename.split(".")[-1]
-    unique_name = f"{uuid.uuid4()}.{ext}"
-    file_path = os.path.join(MESSAGE_UPLOAD_DIR, unique_name)
+    sha = hashlib.sha256()
+    size = 0
+
+    # stream to a temp file in the same dir → os.replace is atomic
+    fd, tmp_path = tempfile.mkstemp(dir=MESSAGE_UPLOAD_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_FILE_SIZE_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds {MAX_FILE_SIZE_MB} MB"
+                    )
+                sha.update(chunk)
+                buffer.write(chunk)
+
+        digest = sha.hexdigest()
+        file_path = content_path(digest)
 
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
+        if os.path.exists(file_path):
+            os.remove(tmp_path)    # same bytes already stored
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
     return {
         "file_name": file.filename,
         "file_path": file_path,
-        "file_type": file.content_type
+        "file_type": file.content_type,
+        "content_hash": digest,
+        "file_size": size
     }
@@ -0,0 +1,106 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event, literal_column
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import visitors
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app.database builds the MySQL URL at import; tests never connect to it
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASSWORD", "test")
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "3306")
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+
+from app.database import Base          # noqa: E402
+from app.models import load_all_models  # noqa: E402
+
+load_all_models()
+
+
+# ------------------------------------------------------------------
+# MySQL upserts on sqlite
+# The services use INSERT … ON DUPLICATE KEY UPDATE; sqlite (>= 3.35)
+# has the same semantics as ON CONFLICT DO UPDATE without a target.
+# ------------------------------------------------------------------
+@compiles(mysql.Insert, "sqlite")
+def _mysql_upsert_on_sqlite(insert, compiler, **kw):
+    clause = insert._post_values_clause
+    if clause is None:
+        return compiler.visit_insert(insert, **kw)
+
+    plain = insert._clone()
+    plain._post_values_clause = None
+    sql = compiler.visit_insert(plain, **kw)
+
+    inserted = insert.inserted_alias
+
+    def excluded(element):
+        # VALUES(col) / stmt.inserted.col → excluded.col
+        if getattr(element, "table", None) is inserted:
+            return literal_column(f"excluded.{element.name}")
+        return None
+
+    sets = []
+    for key, value in clause.update.items():
+        name = key if isinstance(key, str) else key.name
+        value = visitors.replacement_traverse(value, {}, excluded)
+        sets.append(f"{name} = {compiler.process(value, **kw)}")
+
+    return f"{sql} ON CONFLICT DO UPDATE SET {', '.join(sets)}"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # file database → several sessions / threads can share it
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False, "timeout": 10}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_session(engine):
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture
+def db(make_session):
+    session = make_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def query_counter(engine):
+    """Counts statements sent to the database (reset with .clear())."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    yield statements
+    event.remove(engine, "before_cursor_execute", _count)
+
+
+@pytest.fixture
+def fast_hashing(monkeypatch):
+    """Cheap password hashes; bcrypt cost is not what these tests check."""
+    from passlib.context import CryptContext
+    from app import security
+
+    monkeypatch.setattr(security, "pwd_context", CryptContext(
+        schemes=["sha256_crypt"], sha256_crypt__rounds=1000
+    ))
@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.section import Section
+from app.models.student import Student
+from app.models.student_attendance import StudentAttendance
+from app.models.student_attendance_rollup import StudentAttendanceRollup
+from app.routers import attendance
+from app.schemas.attendance import StudentAttendanceCreate
+from app.services.attendance_rollup import lock_student_rollup, refresh_student_rollup
+
+DAY = date(2026, 4, 1)
+KEY = (1, 10, 100, DAY)
+
+
+@pytest.fixture(params=["sqlite", "mysql"])
+def rollup_engine(request, engine):
+    if request.param == "sqlite":
+        yield engine
+        return
+
+    # row-level locking is what makes the race possible → run on MySQL too
+    url = os.getenv("TEST_MYSQL_URL")
+    if not url:
+        pytest.skip("TEST_MYSQL_URL not set")
+
+    mysql_engine = create_engine(url)
+    Base.metadata.drop_all(mysql_engine)
+    Base.metadata.create_all(mysql_engine)
+    yield mysql_engine
+    Base.metadata.drop_all(mysql_engine)
+    mysql_engine.dispose()
+
+
+def _seed(Session):
+    with Session() as db:
+        db.add_all([
+            Student(
+                id=i, name=f"S{i}", admission_no=f"A{i}", class_name="10",
+                class_id=10, section_id=100, institute_id=1
+            )
+            for i in (1, 2)
+        ])
+        db.commit()
+
+
+def _mark(db, student_id, status="present"):
+    db.add(StudentAttendance(
+        student_id=student_id, class_id=10, section_id=100,
+        institute_id=1, date=DAY, status=status
+    ))
+    db.flush()
+
+
+def _rollup(Session):
+    with Session() as db:
+        row = db.query(StudentAttendanceRollup).one()
+        return row.present, row.total
+
+
+def test_concurrent_marks_for_same_day_are_not_lost(rollup_engine):
+    Session = sessionmaker(bind=rollup_engine, autoflush=False)
+    _seed(Session)
+
+    a, b = Session(), Session()
+    b_done = threading.Event()
+
+    # A: lock the key and write, but don't commit yet
+    lock_student_rollup(a, [KEY])
+    _mark(a, 1)
+
+    def second_writer():
+        # B must wait for A's commit before it can recount
+        lock_student_rollup(b, [KEY])
+        _mark(b, 2)
+        refresh_student_rollup(b, [KEY])
+        b.commit()
+        b_done.set()
+
+    thread = threading.Thread(target=second_writer)
+    thread.start()
+    time.sleep(0.3)
+    assert not b_done.is_set()
+
+    refresh_student_rollup(a, [KEY])
+    a.commit()
+
+    thread.join(timeout=15)
+    a.close()
+    b.close()
+
+    assert b_done.is_set()
+    assert _rollup(Session) == (2, 2)
+
+
+def test_remark_updates_rollup_in_place(db, make_session):
+    _seed(make_session)
+    user = SimpleNamespace(institute_id=1)
+
+    for student_id, status in ((1, "present"), (2, "present"), (2, "absent")):
+        attendance.mark_student_attendance(
+            StudentAttendanceCreate(
+                student_id=student_id, class_id=10, date=DAY, status=status
+            ),
+            db=db,
+            user=user
+        )
+
+    row = db.query(StudentAttendanceRollup).one()
+    assert (row.present, row.absent, row.total) == (1, 1, 2)
+
+
+def test_section_from_another_class_is_rejected(db, make_session):
+    _seed(make_session)
+    db.add(Section(id=200, name="A", class_id=11, institute_id=1))
+    db.commit()
+
+    with pytest.raises(HTTPException) as e:
+        attendance.mark_student_attendance(
+            StudentAttendanceCreate(
+                student_id=1, class_id=10, section_id=200, date=DAY, status="present"
+            ),
+            db=db,
+            user=SimpleNamespace(institute_id=1)
+        )
+
+    assert e.value.status_code == 400
+    assert db.query(StudentAttendance).count() == 0
+
+
+def test_concurrent_first_mark_is_an_update(db, make_session, monkeypatch):
+    _seed(make_session)
+    real_lock = attendance.lock_student_rollup
+
+    def other_request_wins(session, keys):
+        # another request inserts the same (student, date) after our read
+        with make_session() as other:
+            _mark(other, 1, status="absent")
+            other.commit()
+        real_lock(session, keys)
+
+    monkeypatch.setattr(attendance, "lock_student_rollup", other_request_wins)
+
+    attendance.mark_student_attendance(
+        StudentAttendanceCreate(student_id=1, class_id=10, date=DAY, status="present"),
+        db=db,
+        user=SimpleNamespace(institute_id=1)
+    )
+
+    row = db.query(StudentAttendance).one()
+    assert row.status == "present"
+    rollup = db.query(StudentAttendanceRollup).one()
+    assert (rollup.present, rollup.absent, rollup.total) == (1, 0, 1)
@@ -0,0 +1,66 @@
+from datetime import date
+from types import SimpleNamespace
+
+from app.models.class_model import SchoolClass
+from app.models.section import Section
+from app.models.student import Student
+from app.models.student_fee import StudentFee
+from app.routers.classes import list_classes
+
+
+def _seed(db, classes):
+    for c in range(1, classes + 1):
+        db.add(SchoolClass(id=c, name=str(c), institute_id=1))
+        for s, name in enumerate(("A", "B")):
+            db.add(Section(id=c * 10 + s, name=name, class_id=c, institute_id=1))
+        for i in range(4):
+            sid = c * 100 + i
+            db.add(Student(
+                id=sid, name=f"S{sid}", admission_no=f"A{sid}",
+                class_name=str(c), class_id=c, section="A" if i < 3 else "B",
+                gender="male" if i % 2 else "female", caste="gen",
+                institute_id=1
+            ))
+            db.add(StudentFee(
+                student_id=sid, class_id=c, total_amount=100,
+                paid_amount=50 if i else 100, due_date=date(2026, 4, 1),
+                institute_id=1
+            ))
+    db.commit()
+
+
+def _queries_for(db, query_counter, classes):
+    _seed(db, classes)
+    query_counter.clear()
+    payload = list_classes(db=db, user=SimpleNamespace(institute_id=1))
+    return len(query_counter), payload
+
+
+def test_list_classes_query_count_does_not_grow_with_classes(make_session, query_counter):
+    with make_session() as db:
+        few, payload = _queries_for(db, query_counter, classes=2)
+
+    assert len(payload) == 2
+    assert few == 4     # classes, students, sections, fees — no N+1
+
+
+def test_list_classes_many_classes_same_query_count(make_session, query_counter):
+    with make_session() as db:
+        many, payload = _queries_for(db, query_counter, classes=12)
+
+    assert len(payload) == 12
+    assert many == 4
+
+
+def test_list_classes_payload(db, query_counter):
+    _, payload = _queries_for(db, query_counter, classes=1)
+    cls = payload[0]
+
+    assert cls["students_count"] == 4
+    assert cls["boys_percent"] == 50
+    assert cls["sections"] == [
+        {"id": 10, "name": "A", "total": 3},
+        {"id": 11, "name": "B", "total": 1},
+    ]
+    assert cls["fees_stats"]["paid"] == 250
+    assert cls["fees_stats"]["pending"] == 150
@@ -0,0 +1,58 @@
+from datetime import date
+
+import pytest
+
+from app.services import dashboard_snapshot
+
+
+class DictBackend:
+    """Stands in for a shared store (e.g. Redis) seen by every worker."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl_seconds):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    calls = []
+
+    def compute(db, institute_id, today=None):
+        calls.append(institute_id)
+        return {"students": len(calls), "date": date.today().isoformat()}
+
+    monkeypatch.setattr(dashboard_snapshot, "compute_snapshot", compute)
+    monkeypatch.setattr(dashboard_snapshot, "_cache", dashboard_snapshot.OrderedDict())
+    yield calls
+    dashboard_snapshot.set_snapshot_backend(None)
+
+
+def test_backend_invalidation_reaches_every_worker(computed):
+    backend = DictBackend()
+    dashboard_snapshot.set_snapshot_backend(backend)
+
+    assert dashboard_snapshot.get_snapshot(None, 1)["students"] == 1
+    assert dashboard_snapshot.get_snapshot(None, 1)["students"] == 1
+
+    # another worker wrote and invalidated → only the shared key is gone
+    backend.delete(dashboard_snapshot._key(1))
+
+    assert dashboard_snapshot.get_snapshot(None, 1)["students"] == 2
+    assert not dashboard_snapshot._cache
+
+
+def test_local_cache_without_backend(computed):
+    assert dashboard_snapshot.get_snapshot(None, 1)["students"] == 1
+    assert dashboard_snapshot.get_snapshot(None, 1)["students"] == 1
+
+    dashboard_snapshot.invalidate_dashboard(1)
+
+    assert dashboard_snapshot.get_snapshot(None, 1)["students"] == 2
@@ -0,0 +1,14 @@
+import pytest
+from fastapi import HTTPException
+
+from app.routers.exams import parse_marks_csv
+
+
+def test_non_utf8_csv_is_a_400(db):
+    content = "student_id,Français\n1,78\n".encode("latin-1")
+
+    with pytest.raises(HTTPException) as e:
+        parse_marks_csv(db, 1, content)
+
+    assert e.value.status_code == 400
+    assert e.value.detail == "CSV must be UTF-8"
@@ -0,0 +1,48 @@
+from app.models.class_model import SchoolClass
+from app.models.student import Student
+from app.models.user import User
+from app.services.login_provisioning import provision_logins
+
+
+def _students(db, n):
+    db.add(SchoolClass(id=1, name="5", institute_id=1))
+    for i in range(1, n + 1):
+        db.add(Student(
+            id=i, name=f"S{i}", admission_no=f"A{i}", class_name="5",
+            class_id=1, institute_id=1
+        ))
+    db.add(User(
+        id=500, name="Admin", email="taken@school.in", password="x",
+        role="admin", institute_id=1
+    ))
+    db.commit()
+
+
+def test_emails_are_normalised(db, fast_hashing):
+    _students(db, 1)
+
+    result = provision_logins(db, Student, "student", 1, [
+        {"id": 1, "email": "  Riya@School.IN ", "password": "pw"},
+    ])
+
+    assert result["created"] == 1
+    assert result["logins"] == [{"id": 1, "email": "riya@school.in"}]
+    user = db.query(User).filter(User.email == "riya@school.in").one()
+    assert db.get(Student, 1).user_id == user.id
+
+
+def test_case_only_duplicates_are_row_errors(db, fast_hashing):
+    _students(db, 3)
+
+    result = provision_logins(db, Student, "student", 1, [
+        {"id": 1, "email": "dev@school.in", "password": "pw"},
+        {"id": 2, "email": "DEV@School.in", "password": "pw"},
+        {"id": 3, "email": " Taken@school.in", "password": "pw"},
+    ])
+
+    assert result["created"] == 1
+    assert [(e["id"], e["error"]) for e in result["errors"]] == [
+        (2, "Email already exists"),
+        (3, "Email already exists"),
+    ]
+    assert db.get(Student, 2).user_id is None
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from app import security
+from app.services import password_pool
+
+
+@pytest.fixture
+def pool(fast_hashing, monkeypatch):
+    monkeypatch.setattr(password_pool, "PASSWORD_HASH_WORKERS", 3)
+    yield password_pool
+    password_pool.shutdown_password_pool()
+
+
+def test_bulk_hashes_keep_input_order(pool):
+    passwords = [f"pw{i}" for i in range(40)]
+
+    hashes = pool.hash_passwords(passwords)
+
+    assert len(hashes) == 40
+    assert all(security.verify_password(p, h) for p, h in zip(passwords, hashes))
+
+
+def test_logins_and_bulk_hashing_share_one_pool(pool):
+    hashed = pool.hash_passwords([f"pw{i}" for i in range(8)])
+    executor = pool._executor
+
+    valid, _ = asyncio.run(pool.check_password_async("pw3", hashed[3]))
+
+    assert valid
+    assert pool._executor is executor
+
+
+def test_shutdown_stops_the_pool(pool):
+    pool.hash_passwords([f"pw{i}" for i in range(8)])
+
+    pool.shutdown_password_pool()
+
+    assert pool._executor is None
@@ -0,0 +1,85 @@
+from concurrent.futures import Future
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import report_pdf
+
+
+@pytest.fixture
+def pdf_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_pdf, "REPORT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(report_pdf, "_jobs", {})
+    yield tmp_path
+    report_pdf.shutdown_render_pool()
+
+
+def test_job_id_changes_with_the_data():
+    header = ["Name", "Status"]
+    before = report_pdf._job_id(1, "k", "t", header, [["A", "present"]])
+    after = report_pdf._job_id(1, "k", "t", header, [["A", "absent"]])
+
+    assert before != after
+    assert before == report_pdf._job_id(1, "k", "t", header, [["A", "present"]])
+    assert report_pdf.JOB_ID_PATTERN.match(before)
+
+
+def test_wait_for_unknown_job_without_file(pdf_cache):
+    job_id = report_pdf._job_id(1, "k", "t", [], [])
+
+    assert report_pdf.wait_pdf_job(job_id) is None
+
+
+def test_wait_for_job_rendered_by_another_worker(pdf_cache):
+    job_id = report_pdf._job_id(1, "k", "t", [], [])
+    (pdf_cache / f"{job_id}.pdf").write_bytes(b"%PDF")
+
+    assert report_pdf.wait_pdf_job(job_id) == report_pdf.job_path(job_id)
+
+
+def test_shutdown_render_pool(pdf_cache):
+    report_pdf._get_executor()
+    report_pdf.shutdown_render_pool()
+
+    assert report_pdf._executor is None
+
+
+class _BrokenPool:
+    def submit(self, *args):
+        raise RuntimeError("pool is shut down")
+
+
+def test_submit_error_marks_the_job_failed(pdf_cache, monkeypatch):
+    monkeypatch.setattr(report_pdf, "_get_executor", lambda: _BrokenPool())
+
+    with pytest.raises(RuntimeError):
+        report_pdf.submit_pdf_job(1, "k", "t", [], [])
+
+    job_id = report_pdf._job_id(1, "k", "t", [], [])
+    assert report_pdf._jobs[job_id]["status"] == "failed"
+
+
+def test_identical_request_sees_the_future(pdf_cache, monkeypatch):
+    pending = Future()
+    monkeypatch.setattr(
+        report_pdf, "_get_executor",
+        lambda: type("Pool", (), {"submit": lambda self, *a: pending})()
+    )
+
+    first = report_pdf.submit_pdf_job(1, "k", "t", [], [])
+    second = report_pdf.submit_pdf_job(1, "k", "t", [], [])
+
+    assert first == second
+    assert report_pdf._jobs[first]["future"] is pending
+
+
+def test_running_job_without_future_is_pending(pdf_cache):
+    job_id = report_pdf._job_id(1, "k", "t", [], [])
+    report_pdf._jobs[job_id] = {
+        "institute_id": 1, "status": "running", "error": None,
+        "future": None, "created": 0
+    }
+
+    with pytest.raises(HTTPException) as e:
+        report_pdf.wait_pdf_job(job_id)
+    assert e.value.status_code == 409
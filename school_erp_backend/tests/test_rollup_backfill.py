@@ -0,0 +1,54 @@
+import importlib.util
+import os
+from datetime import date
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app.models.student_attendance import StudentAttendance
+from app.models.employee_attendance import EmployeeAttendance
+from app.models.student_attendance_rollup import StudentAttendanceRollup
+from app.models.employee_attendance_rollup import EmployeeAttendanceRollup
+from conftest import ROOT
+
+MIGRATION = os.path.join(ROOT, "alembic", "versions", "0002_index_pack.py")
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("index_pack", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_backfill_groups_existing_attendance(engine, db):
+    day = date(2026, 4, 1)
+    for i, status in enumerate(["present", "present", "absent", "leave"]):
+        db.add(StudentAttendance(
+            student_id=i + 1, class_id=1, section_id=10 if i < 3 else 11,
+            institute_id=1, date=day, status=status
+        ))
+    for i, status in enumerate(["present", "absent"]):
+        db.add(EmployeeAttendance(
+            employee_id=i + 1, institute_id=1, date=day, status=status
+        ))
+    # stale row from before the migration → replaced
+    db.add(EmployeeAttendanceRollup(
+        institute_id=1, date=day, present=9, absent=9, leave=9, total=27
+    ))
+    db.commit()
+
+    migration = _load_migration()
+    with engine.begin() as conn:
+        migration.op = Operations(MigrationContext.configure(conn))
+        for rollup, raw, keys in migration.ROLLUPS:
+            migration._backfill(rollup, raw, keys)
+
+    students = {
+        r.section_id: (r.present, r.absent, r.leave, r.total)
+        for r in db.query(StudentAttendanceRollup)
+    }
+    assert students == {10: (2, 1, 0, 3), 11: (0, 0, 1, 1)}
+
+    employees = db.query(EmployeeAttendanceRollup).one()
+    assert (employees.present, employees.absent, employees.leave, employees.total) == (1, 1, 0, 2)
@@ -0,0 +1,88 @@
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.class_model import SchoolClass
+from app.models.section import Section
+from app.models.student import Student
+from app.models.student_extra_data import StudentExtraData
+from app.models.student_form_field import StudentFormField
+from app.services.student_import import import_students, read_rows
+
+
+@pytest.fixture
+def school(db):
+    db.add(SchoolClass(id=1, name="10", institute_id=1))
+    db.add(Section(id=10, name="A", class_id=1, institute_id=1))
+    db.add(StudentFormField(
+        institute_id=1, field_key="bus_route", field_label="Bus route",
+        field_type="text", is_active=True
+    ))
+    db.add(Student(
+        id=1, name="Existing", admission_no="A1", class_name="10",
+        class_id=1, institute_id=1
+    ))
+    db.commit()
+    return db
+
+
+def _csv(*lines):
+    return BytesIO("\n".join(lines).encode("utf-8"))
+
+
+def _file():
+    return _csv(
+        "Student Name,Admission Number,Class,Section,Bus Route",
+        "Riya,A2,10,a,R7",              # ok, section case-insensitive, extra field
+        "Dev,A1,10,A,",                 # taken
+        "Meera,A2,10,A,",               # repeated in file
+        "Kabir,A3,9,A,",                # unknown class
+        "Sana,A4,10,Z,",                # unknown section
+        "Aarav,A5,10,,R2",              # ok, no section
+    )
+
+
+def test_import_reports_bad_rows_and_inserts_the_rest(school):
+    report = import_students(school, 1, "students.csv", _file(), chunk_size=4)
+
+    assert (report["total"], report["imported"], report["failed"]) == (6, 2, 4)
+    assert {e["row"]: e["errors"] for e in report["errors"]} == {
+        3: ["Admission number already exists"],
+        4: ["Admission number repeated in file"],
+        5: ["Unknown class '9'"],
+        6: ["Unknown section 'Z' for class 10"],
+    }
+
+    riya = school.query(Student).filter(Student.admission_no == "A2").one()
+    assert (riya.class_id, riya.section, riya.section_id) == (1, "A", 10)
+
+    extra = {
+        (row.student_id, row.field_key, row.value)
+        for row in school.query(StudentExtraData)
+    }
+    aarav = school.query(Student).filter(Student.admission_no == "A5").one()
+    assert extra == {(riya.id, "bus_route", "R7"), (aarav.id, "bus_route", "R2")}
+
+
+def test_dry_run_writes_nothing(school):
+    report = import_students(school, 1, "students.csv", _file(), dry_run=True)
+
+    assert (report["imported"], report["failed"], report["dry_run"]) == (2, 4, True)
+    assert school.query(Student).count() == 1
+
+
+def test_non_utf8_csv_is_rejected_before_any_insert(school):
+    rows = ["name,admission_no,class"] + [f"S{i},B{i},10" for i in range(5)]
+    content = "\n".join(rows + ["José,B9,10"]).encode("latin-1")
+
+    with pytest.raises(HTTPException) as e:
+        import_students(school, 1, "students.csv", BytesIO(content), chunk_size=2)
+
+    assert e.value.detail == "CSV must be UTF-8"
+    assert school.query(Student).count() == 1
+
+
+def test_unknown_file_type(school):
+    with pytest.raises(HTTPException):
+        list(read_rows("students.txt", BytesIO(b"")))
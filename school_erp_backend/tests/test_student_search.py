@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.class_model import SchoolClass
+from app.models.institute import Institute
+from app.models.student import Student
+from app.routers.students import list_students
+from app.services import student_search
+
+
+def _list(db, search):
+    return list_students(
+        class_name=None, section=None, search=search, after_id=None,
+        limit=None, db=db, user=SimpleNamespace(institute_id=1)
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(student_search, "_indexes", {})
+
+
+@pytest.fixture
+def school(db):
+    db.add(Institute(id=1, name="School", code="S1"))
+    db.add(SchoolClass(id=1, name="5", institute_id=1))
+    for i, name in enumerate(["Kabir Singh", "Aarav Sharma", "Riya Sharma"], start=1):
+        db.add(Student(
+            id=i, name=name, admission_no=f"ADM-{i}12", class_name="5",
+            class_id=1, institute_id=1
+        ))
+    db.commit()
+    return db
+
+
+def _add_student_elsewhere(make_session, student_id, name):
+    # another worker: its write never touches this process' index
+    with make_session() as other:
+        other.add(Student(
+            id=student_id, name=name, admission_no=f"ADM-{student_id}",
+            class_name="5", class_id=1, institute_id=1
+        ))
+        student_search.bump_search_version(other, 1)
+        other.commit()
+
+
+def test_write_in_another_worker_reloads_the_index(school, make_session):
+    assert sorted(student_search.search_student_ids(school, 1, "sharma")) == [2, 3]
+
+    _add_student_elsewhere(make_session, 4, "Dev Sharma")
+    school.expire_all()
+
+    assert sorted(student_search.search_student_ids(school, 1, "sharma")) == [2, 3, 4]
+
+
+def test_local_write_keeps_the_index(school):
+    student_search.search_student_ids(school, 1, "sharma")
+    index = student_search._indexes[1]
+
+    student = Student(
+        id=5, name="Meera Sharma", admission_no="ADM-5",
+        class_name="5", class_id=1, institute_id=1
+    )
+    school.add(student)
+    version = student_search.bump_search_version(school, 1)
+    school.commit()
+    student_search.index_student(student, version)
+
+    assert 5 in student_search.search_student_ids(school, 1, "sharma")
+    assert student_search._indexes[1] is index     # no reload needed
+
+
+def test_list_students_short_query_uses_substring_match(school):
+    # "ab" is inside "Kabir", not a word prefix
+    names = [s["name"] for s in _list(school, "ab")]
+    assert names == ["Kabir Singh"]
+
+    # admission numbers match anywhere too
+    numbers = [s["admission_no"] for s in _list(school, "21")]
+    assert numbers == ["ADM-212"]
+
+    # the index is never built for short queries
+    assert 1 not in student_search._indexes
+
+
+def test_list_students_long_query_uses_index(school):
+    rows = _list(school, "sharma")
+
+    assert sorted(s["id"] for s in rows) == [2, 3]
+    assert 1 in student_search._indexes